@@ -57,7 +57,8 @@ class AssetService:
             skip=skip,
             limit=limit,
             order_by_column=order_column,
-            order_desc=order_desc
+            order_desc=order_desc,
+            with_total=True
         )
         
         # Debug: Check if warranty dates are present
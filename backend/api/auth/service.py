@@ -7,7 +7,7 @@ from datetime import datetime, timedelta, date
 import jwt
 import os
 import hashlib
-from core.auth import create_access_token, verify_token
+from core.auth import clear_role_id_cache, create_access_token, verify_token
 
 # Password hashing
 pwd_context = CryptContext(schemes=["bcrypt"], deprecated="auto")
@@ -437,6 +437,7 @@ class RoleService:
         
         db.commit()
         db.refresh(role)
+        clear_role_id_cache()
         
         return schemas.RoleResponse.from_orm(role)
     
@@ -467,6 +468,7 @@ class RoleService:
         # Soft delete the role
         role.IsActive = False
         db.commit()
+        clear_role_id_cache()
         
         return {"message": f"Role {role_id} deleted"}
 
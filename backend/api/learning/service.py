@@ -166,7 +166,7 @@ class EnrollmentService:
         # Send notification for course enrollment
         try:
             service = NotificationService(db)
-            await service.create_notification(
+            service.create_notification(
                 NotificationCreate(
                     user_id=str(employee_id),  # Convert to string for UserID
                     type="learning",
@@ -289,7 +289,7 @@ class ProgressService:
         # Send notification for module completion
         try:
             service = NotificationService(db)
-            await service.create_notification(
+            service.create_notification(
                 NotificationCreate(
                     user_id=str(enrollment.EmployeeID),
                     type="learning",
@@ -346,7 +346,7 @@ class ProgressService:
             # Send notification for course completion
             try:
                 service = NotificationService(db)
-                await service.create_notification(
+                service.create_notification(
                     NotificationCreate(
                         user_id=str(enrollment.EmployeeID),
                         type="learning",
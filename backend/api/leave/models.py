@@ -1,4 +1,4 @@
-from sqlalchemy import Column, Integer, String, Date, Boolean, DateTime, ForeignKey, DECIMAL, Text, CheckConstraint
+from sqlalchemy import Column, Integer, String, Date, Boolean, DateTime, ForeignKey, DECIMAL, Text, CheckConstraint, Index
 from sqlalchemy.orm import relationship
 from sqlalchemy.sql import func
 from core.database import Base
@@ -84,7 +84,9 @@ class LeaveApplication(Base):
     manager_approval_status = relationship("ApprovalStatus", foreign_keys=[ManagerApprovalStatus])
     hr_approval_status = relationship("ApprovalStatus", foreign_keys=[HRApprovalStatus])
     
-    # Check constraint
+    # Check constraint and indexes
     __table_args__ = (
         CheckConstraint('EndDate >= StartDate', name='CHK_LeaveApplications_Dates'),
+        # Leave/timesheet conflict checks filter on employee, status and date overlap
+        Index("IX_LeaveApplications_EmployeeStatusDates", "EmployeeID", "StatusCode", "StartDate", "EndDate"),
     ) 
\ No newline at end of file
@@ -115,7 +115,8 @@ class LeaveService:
             skip=skip,
             limit=limit,
             order_by_column=models.LeaveApplication.StartDate,
-            order_desc=True
+            order_desc=True,
+            with_total=True
         )
 
     @staticmethod
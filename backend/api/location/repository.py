@@ -6,7 +6,7 @@ This module provides data access operations for Location entities.
 from typing import List, Optional, Dict, Any
 from sqlalchemy.orm import Session
 from sqlalchemy import and_
-from core.repository import SearchableRepository
+from core.repository import SearchableRepository, FULLTEXT_SEARCH_ENABLED
 from . import models, schemas
 
 class LocationRepository(SearchableRepository[models.Location, schemas.LocationCreate, schemas.LocationUpdate]):
@@ -15,6 +15,9 @@ class LocationRepository(SearchableRepository[models.Location, schemas.LocationC
     Extends SearchableRepository with Location-specific operations.
     """
     
+    # Locations has the full-text index created by scripts/migrate_fulltext_indexes.py
+    fulltext_search = FULLTEXT_SEARCH_ENABLED
+    
     def __init__(self):
         super().__init__(models.Location)
     
@@ -6,11 +6,12 @@ from sqlalchemy import func, and_
 from core.database import get_db
 from core.auth import get_current_user
 from core.notification_service import NotificationService
-from core.notification_worker import deliver_desktop_notification
+from core.notification_worker import deliver_desktop_notification, enqueue_desktop_delivery
 from core.models import NotificationDelivery
 from api.notifications.schemas import (
     NotificationCreate,
     NotificationRead,
+    NotificationListWithCounts,
     UserNotificationPreferenceRead,
     UserNotificationPreferenceUpdate
 )
@@ -20,7 +21,7 @@ router = APIRouter(prefix="/notifications", tags=["Notifications"])
 
 
 @router.post("/", response_model=NotificationRead)
-async def create_notification(
+def create_notification(
     data: NotificationCreate,
     background_tasks: BackgroundTasks,
     current_user: User = Depends(get_current_user),
@@ -29,7 +30,7 @@ async def create_notification(
     """Create a new notification."""
     try:
         service = NotificationService(db)
-        notification = await service.create_notification(data)
+        notification = service.create_notification(data)
         
         # Get the desktop delivery record to trigger background delivery
         desktop_delivery = db.query(NotificationDelivery).filter(
@@ -39,7 +40,8 @@ async def create_notification(
             )
         ).first()
         
-        if desktop_delivery:
+        # Hand the delivery to the batching worker, or deliver it on its own
+        if desktop_delivery and not enqueue_desktop_delivery(desktop_delivery.Id):
             background_tasks.add_task(
                 deliver_desktop_notification, 
                 desktop_delivery.Id, 
@@ -52,7 +54,7 @@ async def create_notification(
 
 
 @router.get("/", response_model=List[NotificationRead])
-async def list_user_notifications(
+def list_user_notifications(
     limit: int = Query(50, ge=1, le=100),
     offset: int = Query(0, ge=0),
     unread_only: bool = Query(False),
@@ -62,7 +64,7 @@ async def list_user_notifications(
     """List notifications for the current user."""
     try:
         service = NotificationService(db)
-        notifications = await service.list_user_notifications(
+        notifications = service.list_user_notifications(
             user_id=current_user.UserID,
             limit=limit,
             offset=offset,
@@ -73,22 +75,60 @@ async def list_user_notifications(
         raise HTTPException(status_code=500, detail=f"Failed to list notifications: {str(e)}")
 
 
+@router.get("/summary", response_model=NotificationListWithCounts)
+def list_user_notifications_with_counts(
+    limit: int = Query(50, ge=1, le=100),
+    offset: int = Query(0, ge=0),
+    current_user: User = Depends(get_current_user),
+    db: Session = Depends(get_db)
+):
+    """List notifications for the current user together with total and unread counts."""
+    try:
+        service = NotificationService(db)
+        notifications, total_count, unread_count = service.list_with_counts(
+            user_id=current_user.UserID,
+            limit=limit,
+            offset=offset
+        )
+        return {
+            "items": notifications,
+            "total_count": total_count,
+            "unread_count": unread_count
+        }
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=f"Failed to list notifications: {str(e)}")
+
+
 @router.get("/unread-count")
-async def unread_count(
+def unread_count(
     current_user: User = Depends(get_current_user),
     db: Session = Depends(get_db)
 ):
     """Get count of unread notifications for the current user."""
     try:
         service = NotificationService(db)
-        count = await service.unread_count(current_user.UserID)
+        count = service.unread_count(current_user.UserID)
         return {"count": count}
     except Exception as e:
         raise HTTPException(status_code=500, detail=f"Failed to get unread count: {str(e)}")
 
 
+@router.get("/has-unread")
+def has_unread(
+    current_user: User = Depends(get_current_user),
+    db: Session = Depends(get_db)
+):
+    """Check whether the current user has any unread notification."""
+    try:
+        service = NotificationService(db)
+        has_unread = service.has_unread(current_user.UserID)
+        return {"has_unread": has_unread}
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=f"Failed to check unread notifications: {str(e)}")
+
+
 @router.post("/{notification_id}/read")
-async def mark_as_read(
+def mark_as_read(
     notification_id: str,
     current_user: User = Depends(get_current_user),
     db: Session = Depends(get_db)
@@ -96,7 +136,7 @@ async def mark_as_read(
     """Mark a notification as read."""
     try:
         service = NotificationService(db)
-        success = await service.mark_as_read(notification_id, current_user.UserID)
+        success = service.mark_as_read(notification_id, current_user.UserID)
         
         if not success:
             raise HTTPException(
@@ -112,7 +152,7 @@ async def mark_as_read(
 
 
 @router.put("/preferences", response_model=UserNotificationPreferenceRead)
-async def upsert_user_preferences(
+def upsert_user_preferences(
     preferences: UserNotificationPreferenceUpdate,
     current_user: User = Depends(get_current_user),
     db: Session = Depends(get_db)
@@ -146,7 +186,7 @@ async def upsert_user_preferences(
 
 
 @router.get("/preferences", response_model=UserNotificationPreferenceRead)
-async def get_user_preferences(
+def get_user_preferences(
     current_user: User = Depends(get_current_user),
     db: Session = Depends(get_db)
 ):
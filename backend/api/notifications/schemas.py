@@ -1,5 +1,5 @@
 from datetime import datetime, time
-from typing import Optional, Dict, Any
+from typing import Optional, Dict, Any, List
 from pydantic import BaseModel, Field
 
 
@@ -31,6 +31,12 @@ class NotificationRead(NotificationBase):
         from_attributes = True
 
 
+class NotificationListWithCounts(BaseModel):
+    items: List[NotificationRead]
+    total_count: int
+    unread_count: int
+
+
 class NotificationDeliveryRead(BaseModel):
     id: str = Field(..., max_length=36)
     channel: str = Field(..., max_length=20)
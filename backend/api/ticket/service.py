@@ -12,6 +12,16 @@ from core.pagination import paginate_query
 from core.notification_service import NotificationService
 from api.notifications.schemas import NotificationCreate
 
+# Active ticket status codes, loaded once per process on first validation.
+# TicketStatuses is seeded reference data; call clear_ticket_status_cache()
+# after changing it.
+_active_status_codes: Optional[frozenset] = None
+
+def clear_ticket_status_cache() -> None:
+    """Force the next status validation to reload the active status codes"""
+    global _active_status_codes
+    _active_status_codes = None
+
 class TicketService:
     
     @staticmethod
@@ -65,7 +75,8 @@ class TicketService:
             # Create notification service
             notification_service = NotificationService(db)
             
-            # Create notification for each IT employee
+            # Build a notification for each IT employee
+            notifications = []
             for it_employee in it_employees:
                 # Skip if the ticket was opened by an IT employee
                 if it_employee.EmployeeID == opened_by_employee.EmployeeID:
@@ -93,9 +104,11 @@ class TicketService:
                     }),
                     expires_at=datetime.utcnow() + timedelta(days=7)  # Expire after 7 days
                 )
-                
-                # Create notification
-                notification_service.create_notification(notification_data)
+                notifications.append(notification_data)
+            
+            # Create all notifications in a single transaction
+            if notifications:
+                notification_service.create_notifications_bulk(notifications)
                 
         except Exception as e:
             # Log error but don't fail the ticket creation
@@ -155,15 +168,15 @@ class TicketService:
     @staticmethod
     def validate_status_code(db: Session, status_code: str) -> bool:
         """Validate that status code exists in lookup table"""
-        # Use case-sensitive comparison to avoid database collation issues
-        from sqlalchemy import text
-        query = text("""
-            SELECT * FROM TicketStatuses 
-            WHERE TicketStatusCode COLLATE SQL_Latin1_General_CP1_CS_AS = :status_code 
-            AND IsActive = 1
-        """)
-        result = db.execute(query, {"status_code": status_code}).fetchone()
-        return result is not None
+        # Python set membership is case-sensitive regardless of database collation
+        global _active_status_codes
+        if _active_status_codes is None:
+            _active_status_codes = frozenset(
+                code for (code,) in db.query(models.TicketStatus.TicketStatusCode).filter(
+                    models.TicketStatus.IsActive == True
+                ).all()
+            )
+        return status_code in _active_status_codes
     
     @staticmethod
     def validate_category_id(db: Session, category_id: int) -> bool:
@@ -296,7 +309,7 @@ class TicketService:
             else:
                 query = query.filter(models.Ticket.StatusCode.in_(["Closed", "Cancelled"]))
         
-        return paginate_query(query, skip, limit, models.Ticket.CreatedAt)
+        return paginate_query(query, skip, limit, models.Ticket.CreatedAt, with_total=True)
     
     @staticmethod
     def create_ticket(db: Session, ticket: schemas.TicketCreate, opened_by_id: int) -> models.Ticket:
@@ -1,4 +1,4 @@
-from sqlalchemy import Column, Integer, String, Date, Boolean, DateTime, ForeignKey, DECIMAL, Text, CheckConstraint
+from sqlalchemy import Column, Integer, String, Date, Boolean, DateTime, ForeignKey, DECIMAL, Text, CheckConstraint, Index, UniqueConstraint
 from sqlalchemy.orm import relationship
 from sqlalchemy.sql import func
 from core.database import Base
@@ -34,9 +34,13 @@ class Timesheet(Base):
     approved_by = relationship("Employee", foreign_keys=[ApprovedByID])
     details = relationship("TimesheetDetail", back_populates="timesheet", cascade="all, delete-orphan")
     
-    # Check constraints
+    # Check constraints and indexes
     __table_args__ = (
         CheckConstraint('WeekEndDate >= WeekStartDate', name='CHK_Timesheets_Dates'),
+        UniqueConstraint('EmployeeID', 'WeekStartDate', name='UQ_Timesheets_EmployeeWeek'),
+        # Week-overlap lookups (WeekEndDate >= ? AND WeekStartDate <= ?) per employee;
+        # (EmployeeID, WeekStartDate) is already covered by UQ_Timesheets_EmployeeWeek
+        Index("IX_Timesheets_EmployeeOverlap", "EmployeeID", "WeekEndDate", "WeekStartDate"),
     )
 
 class TimesheetDetail(Base):
@@ -1,6 +1,8 @@
 from sqlalchemy.orm import Session
 from typing import List, Optional
 from datetime import datetime, date, timedelta
+from math import fsum
+from operator import attrgetter
 from . import models, schemas
 from fastapi import HTTPException
 from core.pagination import paginate_query
@@ -14,6 +16,7 @@ from core.timesheet_utils import (
     is_valid_work_date,
     get_employee_timesheets_for_period,
     check_leave_conflicts_for_timesheet_upload,
+    check_leave_conflicts_for_timesheet_upload_bulk,
     check_leave_conflicts_for_timesheet_submission,
     check_leave_conflicts_for_timesheet_approval
 )
@@ -37,7 +40,7 @@ class TimesheetService:
         if status_code:
             query = query.filter(models.Timesheet.StatusCode == status_code)
         
-        return paginate_query(query, skip, limit, models.Timesheet.CreatedAt)
+        return paginate_query(query, skip, limit, models.Timesheet.CreatedAt, with_total=True)
     
     @staticmethod
     def get_timesheet(db: Session, timesheet_id: int, include_details: bool = False) -> Optional[models.Timesheet]:
@@ -70,8 +73,9 @@ class TimesheetService:
             )
         
         # Check for leave conflicts before creating timesheet
-        for detail_data in weekly_data.details:
-            check_leave_conflicts_for_timesheet_upload(db, weekly_data.EmployeeID, detail_data.WorkDate)
+        check_leave_conflicts_for_timesheet_upload_bulk(
+            db, weekly_data.EmployeeID, [detail_data.WorkDate for detail_data in weekly_data.details]
+        )
         
         # Check if timesheet already exists for this week
         existing_timesheet = db.query(models.Timesheet).filter(
@@ -95,11 +99,10 @@ class TimesheetService:
             Comments=weekly_data.Comments
         )
         db.add(timesheet)
-        db.commit()
-        db.refresh(timesheet)
+        # Flush for the TimesheetID; the single commit below covers the details too
+        db.flush()
         
         # Create details for each day
-        total_hours = 0.0
         for detail_data in weekly_data.details:
             # Validate work date is within the week
             if not (weekly_data.WeekStartDate <= detail_data.WorkDate <= weekly_data.WeekEndDate):
@@ -123,10 +126,9 @@ class TimesheetService:
                 IsOvertime=detail_data.IsOvertime
             )
             db.add(detail)
-            total_hours += detail_data.HoursWorked
         
-        # Update total hours
-        timesheet.TotalHours = round(total_hours, 2)
+        # Update total hours (fsum avoids float drift before rounding)
+        timesheet.TotalHours = round(fsum(map(attrgetter("HoursWorked"), weekly_data.details)), 2)
         db.commit()
         db.refresh(timesheet)
         
@@ -170,7 +172,7 @@ class TimesheetService:
             models.TimesheetDetail.TimesheetID == timesheet_id
         )
         
-        return paginate_query(query, skip, limit, models.TimesheetDetail.WorkDate)
+        return paginate_query(query, skip, limit, models.TimesheetDetail.WorkDate, with_total=True)
     
     @staticmethod
     def get_timesheet_detail(db: Session, detail_id: int) -> Optional[models.TimesheetDetail]:
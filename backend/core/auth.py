@@ -5,6 +5,7 @@ This module provides JWT token validation, user authentication, and security dep
 
 from fastapi import Depends, HTTPException, status
 from fastapi.security import HTTPBearer, HTTPAuthorizationCredentials
+from sqlalchemy import and_, literal
 from sqlalchemy.orm import Session
 from datetime import datetime, timedelta, date
 import jwt
@@ -22,6 +23,23 @@ ACCESS_TOKEN_EXPIRE_MINUTES = 240  # 4 hours
 # Security scheme
 oauth2_scheme = HTTPBearer()
 
+# RoleName -> RoleID; roles are reference data, so ids are kept for the process
+# lifetime. Only found roles are cached; role writes call clear_role_id_cache().
+_role_ids: dict = {}
+
+def get_role_id(db: Session, role_name: str) -> Optional[int]:
+    """Get the RoleID for a role name, or None if no such role exists"""
+    role_id = _role_ids.get(role_name)
+    if role_id is None:
+        role_id = db.query(models.Role.RoleID).filter(models.Role.RoleName == role_name).scalar()
+        if role_id is not None:
+            _role_ids[role_name] = role_id
+    return role_id
+
+def clear_role_id_cache() -> None:
+    """Drop cached role ids after roles are created, renamed or deactivated"""
+    _role_ids.clear()
+
 def create_access_token(data: dict, expires_delta: Optional[timedelta] = None):
     """Create a JWT access token"""
     to_encode = data.copy()
@@ -159,9 +177,21 @@ def require_role(required_role: str):
         print(f"🔍 DEBUG: Checking role '{required_role}' for user '{current_user.Username}'")
         
         try:
-            # Get employee record for the user
+            # Role id comes from the process cache; employee and assignment are
+            # resolved in one round trip, the outer join keeping "not assigned" distinct
             from api.employee.models import Employee
-            employee = db.query(Employee).filter(
+            from api.auth.models import EmployeeRole
+            role_id = get_role_id(db, required_role)
+            employee = db.query(
+                Employee.EmployeeCode,
+                EmployeeRole.EmployeeRoleID
+            ).select_from(Employee).outerjoin(
+                EmployeeRole, and_(
+                    EmployeeRole.EmployeeID == Employee.EmployeeID,
+                    EmployeeRole.RoleID == role_id,
+                    EmployeeRole.IsActive == True
+                )
+            ).filter(
                 Employee.UserID == current_user.UserID,
                 Employee.IsActive == True
             ).first()
@@ -175,25 +205,17 @@ def require_role(required_role: str):
             
             print(f"✅ DEBUG: Found employee: {employee.EmployeeCode}")
             
-            # Check if employee has the required role
-            from api.auth.models import EmployeeRole, Role
-            role = db.query(Role).filter(Role.RoleName == required_role).first()
-            
-            if not role:
+            if role_id is None:
                 print(f"❌ DEBUG: Role '{required_role}' not found in system")
                 raise HTTPException(
                     status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
                     detail=f"Role '{required_role}' not found in system"
                 )
             
-            print(f"✅ DEBUG: Found role: {role.RoleName} (ID: {role.RoleID})")
+            print(f"✅ DEBUG: Found role: {required_role} (ID: {role_id})")
             
             # Check if employee has this role assigned
-            employee_role = db.query(EmployeeRole).filter(
-                EmployeeRole.EmployeeID == employee.EmployeeID,
-                EmployeeRole.RoleID == role.RoleID,
-                EmployeeRole.IsActive == True
-            ).first()
+            employee_role = employee.EmployeeRoleID
             
             if not employee_role:
                 print(f"❌ DEBUG: Employee does not have '{required_role}' role")
@@ -224,28 +246,19 @@ require_hr = require_role("HR")
 
 def has_admin_access(user: models.User, db: Session) -> bool:
     """Check if user has admin access (admin role only)"""
-    # Get employee record for the user
     from api.employee.models import Employee
-    employee = db.query(Employee).filter(
-        Employee.UserID == user.UserID,
-        Employee.IsActive == True
-    ).first()
-    
-    if not employee:
-        return False
+    from api.auth.models import EmployeeRole
     
-    # Check if employee has admin role
-    from api.auth.models import EmployeeRole, Role
-    admin_role = db.query(Role).filter(Role.RoleName == "Admin").first()
-    
-    if not admin_role:
+    admin_role_id = get_role_id(db, "Admin")
+    if admin_role_id is None:
         return False
     
-    # Check if employee has admin role assigned
-    employee_role = db.query(EmployeeRole).filter(
-        EmployeeRole.EmployeeID == employee.EmployeeID,
-        EmployeeRole.RoleID == admin_role.RoleID,
+    # Single TOP 1 probe across Employee -> EmployeeRole
+    return db.query(literal(1)).select_from(EmployeeRole).join(
+        Employee, Employee.EmployeeID == EmployeeRole.EmployeeID
+    ).filter(
+        Employee.UserID == user.UserID,
+        Employee.IsActive == True,
+        EmployeeRole.RoleID == admin_role_id,
         EmployeeRole.IsActive == True
-    ).first()
-    
-    return employee_role is not None 
\ No newline at end of file
+    ).first() is not None
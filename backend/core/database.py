@@ -1,18 +1,20 @@
 from sqlalchemy import create_engine, event, text
+from sqlalchemy.ext.asyncio import AsyncEngine, AsyncSession, async_sessionmaker, create_async_engine
 from sqlalchemy.ext.declarative import declarative_base
 from sqlalchemy.orm import sessionmaker, Session
 from sqlalchemy.pool import QueuePool
-from sqlalchemy.exc import SQLAlchemyError, OperationalError, DisconnectionError
+from sqlalchemy.exc import SQLAlchemyError, DBAPIError, OperationalError, DisconnectionError
 import os
+import re
 import logging
 import time
 import threading
-from typing import Generator, Optional
+from typing import Any, AsyncGenerator, Callable, Generator, Optional
 from contextlib import contextmanager
-from functools import wraps
+from dataclasses import dataclass
+from functools import lru_cache, wraps
 
-# Configure logging
-logging.basicConfig(level=logging.INFO)
+# Logging is configured by the application; this module only emits records
 logger = logging.getLogger(__name__)
 
 # Global connection monitoring
@@ -24,31 +26,77 @@ _connection_monitor = {
     "lock": threading.Lock()
 }
 
+# Last successful health probe results as (monotonic timestamp, result).
+# Probes run outside the lock; only publishing a result takes it.
+_health_cache = {
+    "connection": (0.0, None),
+    "health": (0.0, None),
+    "lock": threading.Lock()
+}
+
+def default_pool_size() -> int:
+    """
+    Default per-worker pool size when ``DB_POOL_SIZE`` is not set.
+    
+    Each uvicorn/gunicorn worker owns its own engine, so the pool is sized
+    from the CPUs available to the worker rather than a fixed global number.
+    """
+    return max(5, (os.cpu_count() or 1) * 2)
+
 # Database configuration with environment variable support
+@dataclass(frozen=True, slots=True)
 class DatabaseConfig:
     """Database configuration class with environment variable support"""
     
-    def __init__(self):
-        self.host = os.getenv("DB_HOST", "localhost")
-        self.port = os.getenv("DB_PORT", "1433")
-        self.database = os.getenv("DB_NAME", "echobyte_test")
-        self.username = os.getenv("DB_USERNAME", "sa")
-        self.password = os.getenv("DB_PASSWORD", "YourPassword123!")
-        self.driver = os.getenv("DB_DRIVER", "ODBC+Driver+18+for+SQL+Server")
-        
-        # Connection pool settings - increased for better handling
-        self.pool_size = int(os.getenv("DB_POOL_SIZE", "25"))
-        self.max_overflow = int(os.getenv("DB_MAX_OVERFLOW", "50"))
-        self.pool_timeout = int(os.getenv("DB_POOL_TIMEOUT", "60"))
-        self.pool_recycle = int(os.getenv("DB_POOL_RECYCLE", "1800"))  # 30 minutes
-        
-        # Engine settings
-        self.echo = os.getenv("DB_ECHO", "false").lower() == "true"
-        self.pool_pre_ping = os.getenv("DB_POOL_PRE_PING", "true").lower() == "true"
-        
-        # Retry settings
-        self.max_retries = int(os.getenv("DB_MAX_RETRIES", "3"))
-        self.retry_delay = float(os.getenv("DB_RETRY_DELAY", "1.0"))
+    host: str
+    port: str
+    database: str
+    username: str
+    password: str
+    driver: str
+    
+    # Connection pool settings - increased for better handling
+    pool_size: int
+    max_overflow: int
+    pool_timeout: int
+    pool_recycle: int
+    
+    # Engine settings
+    echo: bool
+    pool_pre_ping: bool
+    
+    # Retry settings
+    max_retries: int
+    retry_delay: float
+    retry_budget: int
+    retry_rate: float
+    
+    # Health probe settings
+    health_ttl: float
+    
+    @classmethod
+    def from_env(cls) -> "DatabaseConfig":
+        """Build a configuration from the current environment variables"""
+        env = os.environ
+        return cls(
+            host=env.get("DB_HOST", "localhost"),
+            port=env.get("DB_PORT", "1433"),
+            database=env.get("DB_NAME", "echobyte_test"),
+            username=env.get("DB_USERNAME", "sa"),
+            password=env.get("DB_PASSWORD", "YourPassword123!"),
+            driver=env.get("DB_DRIVER", "ODBC+Driver+18+for+SQL+Server"),
+            pool_size=int(env["DB_POOL_SIZE"]) if "DB_POOL_SIZE" in env else default_pool_size(),
+            max_overflow=int(env.get("DB_MAX_OVERFLOW", "50")),  # -1 disables the overflow limit
+            pool_timeout=int(env.get("DB_POOL_TIMEOUT", "60")),
+            pool_recycle=int(env.get("DB_POOL_RECYCLE", "1800")),  # 30 minutes
+            echo=env.get("DB_ECHO", "false").lower() == "true",
+            pool_pre_ping=env.get("DB_POOL_PRE_PING", "true").lower() == "true",
+            max_retries=int(env.get("DB_MAX_RETRIES", "3")),
+            retry_delay=float(env.get("DB_RETRY_DELAY", "1.0")),
+            retry_budget=int(env.get("DB_RETRY_BUDGET", "500")),
+            retry_rate=float(env.get("DB_RETRY_RATE", "50")),
+            health_ttl=float(env.get("DB_HEALTH_TTL", "3.0")),
+        )
         
     @property
     def database_url(self) -> str:
@@ -64,8 +112,39 @@ class DatabaseConfig:
             f"Login+Timeout=30"
         )
 
+@lru_cache(maxsize=1)
+def get_db_config() -> DatabaseConfig:
+    """
+    Get the process-wide database configuration.
+    
+    The environment is read on first use only; call ``get_db_config.cache_clear()``
+    to pick up changed environment variables.
+    """
+    return DatabaseConfig.from_env()
+
 # Initialize configuration
-db_config = DatabaseConfig()
+db_config = get_db_config()
+
+def _get_cached_probe(key: str):
+    """Return a cached successful probe result if it is younger than the TTL"""
+    checked_at, result = _health_cache[key]
+    if result is not None and time.monotonic() - checked_at < db_config.health_ttl:
+        return result
+    return None
+
+def _publish_probe(key: str, result) -> None:
+    """Cache a successful probe result, or drop the cached one after a failure"""
+    with _health_cache["lock"]:
+        _health_cache[key] = (time.monotonic(), result)
+
+def _driver_options(database_url: str) -> dict:
+    """Driver-specific engine options for the configured database URL"""
+    if database_url.startswith("mssql+pyodbc"):
+        # Send executemany() batches in a single round trip (bulk inserts)
+        return {"fast_executemany": True}
+    if database_url.startswith("sqlite"):
+        return {"connect_args": {"check_same_thread": False}}
+    return {}
 
 # Create SQLAlchemy engine with enhanced configuration
 engine = create_engine(
@@ -77,9 +156,7 @@ engine = create_engine(
     pool_timeout=db_config.pool_timeout,
     pool_recycle=db_config.pool_recycle,
     pool_pre_ping=db_config.pool_pre_ping,
-    connect_args={
-        "check_same_thread": False,  # For SQLite compatibility
-    } if "sqlite" in db_config.database_url else {}
+    **_driver_options(db_config.database_url)
 )
 
 # Create session factory
@@ -89,6 +166,31 @@ SessionLocal = sessionmaker(
     bind=engine
 )
 
+# Async engine and session factory for ``async def`` endpoints. They are built on
+# first use so the aioodbc driver is only required by code that needs it.
+@lru_cache(maxsize=1)
+def get_async_engine() -> AsyncEngine:
+    """Get the process-wide async engine backed by the aioodbc driver"""
+    return create_async_engine(
+        db_config.database_url.replace("mssql+pyodbc", "mssql+aioodbc", 1),
+        echo=db_config.echo,
+        pool_size=db_config.pool_size,
+        max_overflow=db_config.max_overflow,
+        pool_timeout=db_config.pool_timeout,
+        pool_recycle=db_config.pool_recycle,
+        pool_pre_ping=db_config.pool_pre_ping
+    )
+
+@lru_cache(maxsize=1)
+def get_async_sessionmaker() -> async_sessionmaker:
+    """Get the async session factory bound to the async engine"""
+    return async_sessionmaker(
+        get_async_engine(),
+        class_=AsyncSession,
+        autoflush=False,
+        expire_on_commit=False
+    )
+
 # Base class for all declarative models
 Base = declarative_base()
 
@@ -110,34 +212,140 @@ def validate_connection(db: Session) -> bool:
     except Exception:
         return False
 
-def retry_on_connection_failure(max_retries: int = None, delay: float = None):
+# SQL Server / Azure SQL native error codes that indicate a transient failure
+# worth retrying (see Azure SQL "transient fault error codes"):
+#   4060, 40197, 40501, 40613, 49918, 10928, 10929 - Azure SQL service busy,
+#       database unavailable or resource limits reached
+#   1205 - deadlock victim
+#   233, 10053, 10054, 10060 - transport level / network errors
+_TRANSIENT_CODES = frozenset({40197, 40501, 49918, 10928, 10929, 4060, 40613, 1205, 233, 10053, 10054, 10060})
+# ODBC SQLSTATEs for timeouts and deadlocks; every "08" (connection exception) state is transient too
+_TRANSIENT_SQLSTATES = frozenset({"HYT00", "HYT01", "40001"})
+# pyodbc reports native codes inside the message, e.g. "... (40613) (SQLDriverConnect)"
+_NATIVE_CODE_PATTERN = re.compile(r"\((\d+)\)")
+
+def is_transient_error(error: Exception) -> bool:
     """
-    Decorator to retry database operations on connection failures.
+    Decide whether a database error is transient and safe to retry.
+    
+    The SQLSTATE and native error codes reported by the driver take precedence;
+    when the driver did not report any, connection-level exception classes are
+    treated as transient.
+    
+    Args:
+        error: The exception raised by the database operation
+        
+    Returns:
+        bool: True if the operation may succeed when retried
+    """
+    if isinstance(error, DisconnectionError):
+        return True
+    if not isinstance(error, DBAPIError):
+        return False
+    if error.connection_invalidated:
+        return True
+    
+    args = getattr(error.orig, "args", ())
+    sqlstate = args[0] if args and isinstance(args[0], str) else None
+    message = args[1] if len(args) > 1 and isinstance(args[1], str) else ""
+    native_codes = {int(code) for code in _NATIVE_CODE_PATTERN.findall(message)}
+    
+    if sqlstate is None and not native_codes:
+        return isinstance(error, OperationalError)
+    
+    return (
+        bool(native_codes & _TRANSIENT_CODES)
+        or sqlstate in _TRANSIENT_SQLSTATES
+        or (sqlstate is not None and sqlstate.startswith("08"))
+    )
+
+class _TokenBucket:
+    """
+    Thread-safe token bucket shared by every retrying call in the process.
+    
+    Each retry spends one token and tokens refill at a fixed rate, so the
+    aggregate retry rate stays bounded while the database is struggling.
+    """
+    
+    __slots__ = ("tokens", "capacity", "rate", "last", "lock")
+    
+    def __init__(self, capacity: int, rate: float):
+        self.capacity = float(capacity)
+        self.tokens = float(capacity)
+        self.rate = rate
+        self.last = time.monotonic()
+        self.lock = threading.Lock()
+    
+    def acquire(self) -> bool:
+        """Take one token, returning False when the retry budget is exhausted"""
+        with self.lock:
+            now = time.monotonic()
+            self.tokens = min(self.capacity, self.tokens + (now - self.last) * self.rate)
+            self.last = now
+            if self.tokens < 1:
+                return False
+            self.tokens -= 1
+            return True
+
+# Process-wide retry budget for retry_on_connection_failure
+_retry_bucket = _TokenBucket(db_config.retry_budget, db_config.retry_rate)
+
+def retry_on_connection_failure(
+    max_retries: int = None,
+    delay: float = None,
+    idempotent: bool = True,
+    idempotency_key: Optional[Callable[..., Any]] = None
+):
+    """
+    Decorator to retry database operations on transient connection failures.
+    
+    Only idempotent operations are retried: a connection can drop after a
+    write has already been committed, so retrying a non-idempotent write may
+    apply it twice. Operations with write side effects must either pass
+    ``idempotent=False`` (never retried) or supply ``idempotency_key``.
     
     Args:
         max_retries: Maximum number of retries (defaults to config)
         delay: Delay between retries in seconds (defaults to config)
+        idempotent: Whether repeating the operation yields the same final state
+        idempotency_key: Callable computing a key from the call arguments; the key
+            is computed once and passed to every attempt as the ``idempotency_key``
+            keyword argument so the operation can detect a write that already landed
     """
     max_retries = max_retries or db_config.max_retries
     delay = delay or db_config.retry_delay
+    retryable = idempotent or idempotency_key is not None
     
     def decorator(func):
         @wraps(func)
         def wrapper(*args, **kwargs):
             last_exception = None
+            wait = delay
+            
+            if idempotency_key is not None:
+                kwargs["idempotency_key"] = idempotency_key(*args, **kwargs)
             
             for attempt in range(max_retries + 1):
                 try:
                     return func(*args, **kwargs)
-                except (OperationalError, DisconnectionError) as e:
+                except (DBAPIError, DisconnectionError) as e:
+                    if not retryable or not is_transient_error(e):
+                        # Don't retry non-idempotent operations or non-transient errors
+                        raise
                     last_exception = e
                     if attempt < max_retries:
-                        logger.warning(f"Database connection failed, retrying in {delay}s (attempt {attempt + 1}/{max_retries + 1}): {e}")
-                        time.sleep(delay)
+                        if not _retry_bucket.acquire():
+                            logger.error("Database retry budget exhausted, not retrying: %s", e)
+                            raise
+                        logger.warning(
+                            "Database connection failed, retrying in %ss (attempt %d/%d): %s",
+                            wait, attempt + 1, max_retries + 1, e
+                        )
+                        time.sleep(wait)
                         # Exponential backoff
-                        delay *= 2
+                        wait *= 2
                     else:
-                        logger.error(f"Database connection failed after {max_retries + 1} attempts: {e}")
+                        logger.error("Database connection failed after %d attempts: %s", max_retries + 1, e)
                         raise
                 except Exception as e:
                     # Don't retry on non-connection errors
@@ -147,6 +355,28 @@ def retry_on_connection_failure(max_retries: int = None, delay: float = None):
         return wrapper
     return decorator
 
+def _snapshot_pool() -> dict:
+    """
+    Read the connection pool counters once.
+    
+    The checked-out count is derived from the other counters the same way
+    QueuePool computes it, so the queue size is only sampled a single time
+    and the returned numbers are consistent with each other.
+    
+    Returns:
+        dict: Pool size, checked-in, checked-out and overflow counts
+    """
+    pool = engine.pool
+    size = pool.size()
+    checked_in = pool.checkedin()
+    overflow = pool.overflow()
+    return {
+        "size": size,
+        "checked_in": checked_in,
+        "checked_out": size - checked_in + overflow,
+        "overflow": overflow
+    }
+
 def get_connection_stats() -> dict:
     """
     Get current connection pool statistics.
@@ -154,13 +384,13 @@ def get_connection_stats() -> dict:
     Returns:
         dict: Connection pool statistics
     """
-    pool = engine.pool
+    pool = _snapshot_pool()
     with _connection_monitor["lock"]:
         return {
-            "pool_size": pool.size(),
-            "checked_in": pool.checkedin(),
-            "checked_out": pool.checkedout(),
-            "overflow": pool.overflow(),
+            "pool_size": pool["size"],
+            "checked_in": pool["checked_in"],
+            "checked_out": pool["checked_out"],
+            "overflow": pool["overflow"],
             "active_connections": _connection_monitor["active_connections"],
             "total_requests": _connection_monitor["total_requests"],
             "failed_requests": _connection_monitor["failed_requests"],
@@ -176,20 +406,20 @@ def reset_connection_pool():
         engine.dispose()
         with _connection_monitor["lock"]:
             _connection_monitor["last_reset"] = time.time()
+        _publish_probe("connection", None)
+        _publish_probe("health", None)
         logger.info("Database connection pool reset successfully")
     except Exception as e:
-        logger.error(f"Failed to reset connection pool: {e}")
+        logger.error("Failed to reset connection pool: %s", e)
 
-# Database session dependency for FastAPI with enhanced error handling
-def get_db() -> Generator[Session, None, None]:
+# Shared session lifecycle for get_db and get_db_session
+@contextmanager
+def _session_scope(commit: bool) -> Generator[Session, None, None]:
     """
-    Enhanced dependency function to get database session with proper cleanup.
-    Yields a database session and ensures it's properly closed.
+    Open a validated session, track it in the connection monitor and clean up.
     
-    Usage in FastAPI:
-    @app.get("/items")
-    def read_items(db: Session = Depends(get_db)):
-        return db.query(Item).all()
+    Args:
+        commit: Commit the transaction when the block exits without an error
     """
     db = None
     with _connection_monitor["lock"]:
@@ -208,26 +438,21 @@ def get_db() -> Generator[Session, None, None]:
                 raise OperationalError("Failed to establish valid database connection", None, None)
         
         yield db
+        if commit:
+            db.commit()
         
-    except SQLAlchemyError as e:
-        with _connection_monitor["lock"]:
-            _connection_monitor["failed_requests"] += 1
-        logger.error(f"Database error: {e}")
-        if db:
-            try:
-                db.rollback()
-            except Exception as rollback_error:
-                logger.error(f"Error during rollback: {rollback_error}")
-        raise
     except Exception as e:
         with _connection_monitor["lock"]:
             _connection_monitor["failed_requests"] += 1
-        logger.error(f"Unexpected error: {e}")
+        if isinstance(e, SQLAlchemyError):
+            logger.error("Database error: %s", e)
+        else:
+            logger.error("Unexpected error: %s", e)
         if db:
             try:
                 db.rollback()
             except Exception as rollback_error:
-                logger.error(f"Error during rollback: {rollback_error}")
+                logger.error("Error during rollback: %s", rollback_error)
         raise
     finally:
         if db:
@@ -237,81 +462,90 @@ def get_db() -> Generator[Session, None, None]:
                     db.rollback()
                 db.close()
             except Exception as e:
-                logger.error(f"Error closing database session: {e}")
+                logger.error("Error closing database session: %s", e)
         
         with _connection_monitor["lock"]:
             _connection_monitor["active_connections"] = max(0, _connection_monitor["active_connections"] - 1)
 
+# Database session dependency for FastAPI with enhanced error handling
+def get_db() -> Generator[Session, None, None]:
+    """
+    Enhanced dependency function to get database session with proper cleanup.
+    Yields a database session and ensures it's properly closed.
+    
+    Usage in FastAPI:
+    @app.get("/items")
+    def read_items(db: Session = Depends(get_db)):
+        return db.query(Item).all()
+    """
+    with _session_scope(commit=False) as db:
+        yield db
+
 # Enhanced context manager for database sessions
 @contextmanager
 def get_db_session() -> Generator[Session, None, None]:
     """
     Enhanced context manager for database sessions with proper cleanup.
+    Commits the transaction when the block exits without an error.
     
     Usage:
     with get_db_session() as db:
         result = db.query(Item).all()
     """
-    db = None
+    with _session_scope(commit=True) as db:
+        yield db
+
+# Async database session dependency for FastAPI
+async def get_async_db() -> AsyncGenerator[AsyncSession, None]:
+    """
+    Dependency function to get an async database session with proper cleanup.
+    The sync ``get_db`` remains the default for existing endpoints.
+    
+    Usage in FastAPI:
+    @app.get("/items")
+    async def read_items(db: AsyncSession = Depends(get_async_db)):
+        result = await db.execute(select(Item))
+        return result.scalars().all()
+    """
     with _connection_monitor["lock"]:
-        _connection_monitor["active_connections"] += 1
         _connection_monitor["total_requests"] += 1
     
-    try:
-        db = SessionLocal()
-        
-        # Validate connection before use
-        if not validate_connection(db):
-            logger.warning("Invalid database connection detected, attempting to reset pool")
-            reset_connection_pool()
-            db = SessionLocal()
-            if not validate_connection(db):
-                raise OperationalError("Failed to establish valid database connection", None, None)
-        
-        yield db
-        db.commit()
-        
-    except SQLAlchemyError as e:
-        with _connection_monitor["lock"]:
-            _connection_monitor["failed_requests"] += 1
-        logger.error(f"Database error: {e}")
-        if db:
-            db.rollback()
-        raise
-    except Exception as e:
-        with _connection_monitor["lock"]:
-            _connection_monitor["failed_requests"] += 1
-        logger.error(f"Unexpected error: {e}")
-        if db:
-            db.rollback()
-        raise
-    finally:
-        if db:
+    async with get_async_sessionmaker()() as db:
+        try:
+            yield db
+        except Exception as e:
+            with _connection_monitor["lock"]:
+                _connection_monitor["failed_requests"] += 1
+            logger.error("Database error: %s", e)
             try:
-                db.close()
-            except Exception as e:
-                logger.error(f"Error closing database session: {e}")
-        
-        with _connection_monitor["lock"]:
-            _connection_monitor["active_connections"] = max(0, _connection_monitor["active_connections"] - 1)
+                await db.rollback()
+            except Exception as rollback_error:
+                logger.error("Error during rollback: %s", rollback_error)
+            raise
 
-# Enhanced database connection test function
-@retry_on_connection_failure()
+# Enhanced database connection test function (read-only, so safe to retry)
+@retry_on_connection_failure(idempotent=True)
 def test_database_connection() -> bool:
     """
     Test database connection with retry logic.
+    A successful result is reused for ``DB_HEALTH_TTL`` seconds.
     
     Returns:
         bool: True if connection is successful, False otherwise
     """
+    if _get_cached_probe("connection"):
+        return True
+    
     try:
         with get_db_session() as db:
             # Execute a simple query to test connection
             db.execute(text("SELECT 1"))
             logger.info("Database connection test successful")
-            return True
+        _publish_probe("connection", True)
+        return True
     except Exception as e:
-        logger.error(f"Database connection test failed: {e}")
+        logger.error("Database connection test failed: %s", e)
+        _publish_probe("connection", None)
         return False
 
 # Database initialization function
@@ -335,18 +569,20 @@ def init_database() -> None:
         import api.profile.models
         import core.models  # Import notification models
         
-        # Create all tables
-        Base.metadata.create_all(bind=engine)
-        logger.info("Database tables created successfully")
+        # Create all tables and run the connection probe on one connection;
+        # create_all already checks for existing tables (checkfirst=True)
+        with engine.begin() as connection:
+            Base.metadata.create_all(bind=connection)
+            logger.info("Database tables created successfully")
+            
+            connection.execute(text("SELECT 1"))
         
-        # Test connection
-        if test_database_connection():
-            logger.info("Database initialization completed successfully")
-        else:
-            logger.error("Database initialization failed - connection test failed")
+        _publish_probe("connection", True)
+        logger.info("Connection pool ready: %s", engine.pool.status())
+        logger.info("Database initialization completed successfully")
             
     except Exception as e:
-        logger.error(f"Database initialization failed: {e}")
+        logger.error("Database initialization failed: %s", e)
         raise
 
 # Enhanced event listeners for database operations
@@ -362,14 +598,16 @@ def set_sqlite_pragma(dbapi_connection, connection_record):
 @event.listens_for(engine, "checkout")
 def receive_checkout(dbapi_connection, connection_record, connection_proxy):
     """Log when a connection is checked out from the pool"""
-    logger.debug("Database connection checked out from pool")
+    if logger.isEnabledFor(logging.DEBUG):
+        logger.debug("Database connection checked out from pool")
     with _connection_monitor["lock"]:
         _connection_monitor["active_connections"] += 1
 
 @event.listens_for(engine, "checkin")
 def receive_checkin(dbapi_connection, connection_record):
     """Log when a connection is checked in to the pool"""
-    logger.debug("Database connection checked in to pool")
+    if logger.isEnabledFor(logging.DEBUG):
+        logger.debug("Database connection checked in to pool")
     with _connection_monitor["lock"]:
         _connection_monitor["active_connections"] = max(0, _connection_monitor["active_connections"] - 1)
 
@@ -377,26 +615,30 @@ def receive_checkin(dbapi_connection, connection_record):
 def get_database_health() -> dict:
     """
     Get comprehensive database health status.
+    A healthy result is reused for ``DB_HEALTH_TTL`` seconds.
     
     Returns:
         dict: Health status information
     """
+    cached = _get_cached_probe("health")
+    if cached is not None:
+        return cached
+    
     try:
         with get_db_session() as db:
             # Test basic connectivity
             db.execute(text("SELECT 1"))
             
-            # Get connection pool status
-            pool = engine.pool
+            # Get connection pool status from a single snapshot
             stats = get_connection_stats()
             
             health_status = {
                 "status": "healthy",
                 "connection_pool": {
-                    "size": pool.size(),
-                    "checked_in": pool.checkedin(),
-                    "checked_out": pool.checkedout(),
-                    "overflow": pool.overflow()
+                    "size": stats["pool_size"],
+                    "checked_in": stats["checked_in"],
+                    "checked_out": stats["checked_out"],
+                    "overflow": stats["overflow"]
                 },
                 "monitoring": stats,
                 "database_url": db_config.database_url.replace(db_config.password, "***"),
@@ -410,7 +652,10 @@ def get_database_health() -> dict:
                     "pool_timeout": db_config.pool_timeout,
                     "pool_recycle": db_config.pool_recycle,
                     "max_retries": db_config.max_retries,
-                    "retry_delay": db_config.retry_delay
+                    "retry_delay": db_config.retry_delay,
+                    "retry_budget": db_config.retry_budget,
+                    "retry_rate": db_config.retry_rate,
+                    "health_ttl": db_config.health_ttl
                 }
             }
             
@@ -421,9 +666,11 @@ def get_database_health() -> dict:
             if stats["failed_requests"] > 0:
                 health_status["warnings"] = health_status.get("warnings", []) + [f"{stats['failed_requests']} failed requests"]
             
-            return health_status
+        _publish_probe("health", health_status)
+        return health_status
     except Exception as e:
-        logger.error(f"Database health check failed: {e}")
+        logger.error("Database health check failed: %s", e)
+        _publish_probe("health", None)
         return {
             "status": "unhealthy",
             "error": str(e),
@@ -438,6 +685,9 @@ __all__ = [
     "Base",
     "get_db",
     "get_db_session",
+    "get_async_db",
+    "get_async_engine",
+    "get_async_sessionmaker",
     "test_database_connection",
     "init_database",
     "get_database_health",
@@ -445,5 +695,7 @@ __all__ = [
     "reset_connection_pool",
     "validate_connection",
     "retry_on_connection_failure",
-    "db_config"
+    "is_transient_error",
+    "db_config",
+    "get_db_config"
 ] 
\ No newline at end of file
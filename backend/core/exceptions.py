@@ -3,6 +3,7 @@ Custom exceptions for handling different failure scenarios in the upload process
 This module provides specific exception types for different error conditions.
 """
 
+import re
 from typing import Optional, Dict, Any
 from fastapi import HTTPException
 
@@ -76,6 +77,47 @@ class UploadRollbackError(Exception):
         super().__init__(self.message)
 
 
+# Static error responses shared by the handlers below. Only the status code
+# and detail are shared: a fresh HTTPException is still built per call because
+# raising an exception instance records its traceback and context on it.
+_ERR_AZURE_AUTH = (500, "Azure Storage authentication failed. Please contact system administrator.")
+_ERR_AZURE_PERMISSION = (500, "Azure Storage permission denied. Please contact system administrator.")
+_ERR_AZURE_NOT_FOUND = (500, "Azure Storage resource not found. Please contact system administrator.")
+_ERR_STORAGE_QUOTA = (413, "Storage quota exceeded. Please contact system administrator.")
+_ERR_FK = (400, "Invalid reference. The employee or related record does not exist.")
+_ERR_DUPLICATE = (409, "A record with this information already exists.")
+_ERR_NOT_NULL = (400, "Required information is missing. Please provide all required fields.")
+_ERR_DB_UNAVAILABLE = (503, "Database service is temporarily unavailable. Please try again later.")
+_ERR_FILE_SIZE = (413, "File size exceeds the maximum allowed limit. Please choose a smaller file.")
+_ERR_FILE_TYPE = (400, "File type not supported. Please upload a valid image file (JPEG, PNG, GIF, WebP).")
+_ERR_FILE_CONTENT = (400, "File appears to be corrupted or invalid. Please upload a valid image file.")
+
+# Error-message classifiers. Each pattern is a single alternation whose group
+# order mirrors the precedence of the checks, so one scan over the message
+# picks the same branch the former chain of substring tests did. A ``None``
+# response marks a branch whose detail depends on the call arguments.
+_AZURE_PATTERNS = re.compile(
+    r"(connection|timeout)|(unauthorized|authentication)|(forbidden|permission)|(not found|404)|(quota|limit)",
+    re.IGNORECASE,
+)
+_AZURE_RESPONSES = (None, _ERR_AZURE_AUTH, _ERR_AZURE_PERMISSION, _ERR_AZURE_NOT_FOUND, _ERR_STORAGE_QUOTA)
+
+_DATABASE_PATTERNS = re.compile(
+    r"(foreign key)|(unique|duplicate)|(not null)|(connection|timeout)",
+    re.IGNORECASE,
+)
+_DATABASE_RESPONSES = (_ERR_FK, _ERR_DUPLICATE, _ERR_NOT_NULL, _ERR_DB_UNAVAILABLE)
+
+_VALIDATION_TYPE_PATTERNS = re.compile(r"(size)|(type)|(content)", re.IGNORECASE)
+_VALIDATION_MESSAGE_PATTERNS = re.compile(r"(size)|(format)|(corrupt)", re.IGNORECASE)
+_VALIDATION_RESPONSES = (_ERR_FILE_SIZE, _ERR_FILE_TYPE, _ERR_FILE_CONTENT)
+
+
+def _classify(pattern: "re.Pattern[str]", text: str) -> Optional[int]:
+    """Return the zero-based index of the highest-precedence group matched in ``text``."""
+    return min((match.lastindex - 1 for match in pattern.finditer(text)), default=None)
+
+
 def handle_azure_error(error: Exception, operation: str, details: Optional[Dict[str, Any]] = None) -> HTTPException:
     """
     Handle Azure-related errors and convert to appropriate HTTP exceptions.
@@ -88,49 +130,26 @@ def handle_azure_error(error: Exception, operation: str, details: Optional[Dict[
     Returns:
         HTTPException with appropriate status code and message
     """
-    error_message = str(error)
-    
-    # Azure connection errors
-    if "connection" in error_message.lower() or "timeout" in error_message.lower():
-        return HTTPException(
-            status_code=503,
-            detail=f"Azure Storage service is temporarily unavailable. Please try again later. Operation: {operation}"
-        )
+    index = _classify(_AZURE_PATTERNS, str(error))
     
-    # Azure authentication errors
-    elif "unauthorized" in error_message.lower() or "authentication" in error_message.lower():
-        return HTTPException(
-            status_code=500,
-            detail="Azure Storage authentication failed. Please contact system administrator."
-        )
-    
-    # Azure permission errors
-    elif "forbidden" in error_message.lower() or "permission" in error_message.lower():
+    # Generic Azure error
+    if index is None:
         return HTTPException(
             status_code=500,
-            detail="Azure Storage permission denied. Please contact system administrator."
+            detail=f"Azure Storage error during {operation}. Please try again later."
         )
     
-    # Azure resource not found
-    elif "not found" in error_message.lower() or "404" in error_message.lower():
-        return HTTPException(
-            status_code=500,
-            detail="Azure Storage resource not found. Please contact system administrator."
-        )
+    response = _AZURE_RESPONSES[index]
     
-    # Azure quota exceeded
-    elif "quota" in error_message.lower() or "limit" in error_message.lower():
+    # Azure connection errors
+    if response is None:
         return HTTPException(
-            status_code=413,
-            detail="Storage quota exceeded. Please contact system administrator."
+            status_code=503,
+            detail=f"Azure Storage service is temporarily unavailable. Please try again later. Operation: {operation}"
         )
     
-    # Generic Azure error
-    else:
-        return HTTPException(
-            status_code=500,
-            detail=f"Azure Storage error during {operation}. Please try again later."
-        )
+    status_code, detail = response
+    return HTTPException(status_code=status_code, detail=detail)
 
 
 def handle_database_error(error: Exception, operation: str, details: Optional[Dict[str, Any]] = None) -> HTTPException:
@@ -145,42 +164,17 @@ def handle_database_error(error: Exception, operation: str, details: Optional[Di
     Returns:
         HTTPException with appropriate status code and message
     """
-    error_message = str(error)
-    
-    # Foreign key constraint violations
-    if "foreign key" in error_message.lower():
-        return HTTPException(
-            status_code=400,
-            detail="Invalid reference. The employee or related record does not exist."
-        )
-    
-    # Unique constraint violations
-    elif "unique" in error_message.lower() or "duplicate" in error_message.lower():
-        return HTTPException(
-            status_code=409,
-            detail="A record with this information already exists."
-        )
-    
-    # Not null constraint violations
-    elif "not null" in error_message.lower():
-        return HTTPException(
-            status_code=400,
-            detail="Required information is missing. Please provide all required fields."
-        )
-    
-    # Database connection errors
-    elif "connection" in error_message.lower() or "timeout" in error_message.lower():
-        return HTTPException(
-            status_code=503,
-            detail="Database service is temporarily unavailable. Please try again later."
-        )
+    index = _classify(_DATABASE_PATTERNS, str(error))
     
     # Generic database error
-    else:
+    if index is None:
         return HTTPException(
             status_code=500,
             detail=f"Database error during {operation}. Please try again later."
         )
+    
+    status_code, detail = _DATABASE_RESPONSES[index]
+    return HTTPException(status_code=status_code, detail=detail)
 
 
 def handle_validation_error(error: Exception, validation_type: str, details: Optional[Dict[str, Any]] = None) -> HTTPException:
@@ -197,33 +191,24 @@ def handle_validation_error(error: Exception, validation_type: str, details: Opt
     """
     error_message = str(error)
     
-    # File size validation
-    if "size" in validation_type.lower() or "size" in error_message.lower():
-        return HTTPException(
-            status_code=413,
-            detail="File size exceeds the maximum allowed limit. Please choose a smaller file."
-        )
-    
-    # File type validation
-    elif "type" in validation_type.lower() or "format" in error_message.lower():
-        return HTTPException(
-            status_code=400,
-            detail="File type not supported. Please upload a valid image file (JPEG, PNG, GIF, WebP)."
-        )
-    
-    # File content validation
-    elif "content" in validation_type.lower() or "corrupt" in error_message.lower():
-        return HTTPException(
-            status_code=400,
-            detail="File appears to be corrupted or invalid. Please upload a valid image file."
+    # A branch fires when either the validation type or the message matches it
+    candidates = [
+        index for index in (
+            _classify(_VALIDATION_TYPE_PATTERNS, validation_type),
+            _classify(_VALIDATION_MESSAGE_PATTERNS, error_message),
         )
+        if index is not None
+    ]
     
     # Generic validation error
-    else:
+    if not candidates:
         return HTTPException(
             status_code=400,
             detail=f"File validation failed: {error_message}"
         )
+    
+    status_code, detail = _VALIDATION_RESPONSES[min(candidates)]
+    return HTTPException(status_code=status_code, detail=detail)
 
 
 def create_error_response(error: Exception, context: Dict[str, Any]) -> Dict[str, Any]:
@@ -4,10 +4,16 @@ This module provides locking mechanisms using SELECT FOR UPDATE to ensure
 data consistency during concurrent operations.
 """
 
+import asyncio
+import inspect
 import logging
+import random
 import time
 from typing import Optional, Callable, Any
 from contextlib import contextmanager
+from functools import wraps
+from contextvars import ContextVar
+import anyio
 from sqlalchemy.orm import Session
 from sqlalchemy import text
 from fastapi import HTTPException
@@ -16,12 +22,36 @@ from api.employee.models import Employee
 # Configure logging
 logger = logging.getLogger(__name__)
 
+# (session, employee) pairs locked by an enclosing with_employee_lock call,
+# so nested decorated calls in the same transaction don't lock again
+_locked_employees: ContextVar[frozenset] = ContextVar("locked_employees", default=frozenset())
+
 
 class LockingError(Exception):
     """Custom exception for locking-related errors"""
     pass
 
 
+class LockTimeoutError(LockingError):
+    """Raised when SQL Server gives up waiting for a lock (error 1222)"""
+    pass
+
+
+def _lock_attempts(max_retries: int) -> int:
+    """Number of lock attempts; lock waits happen in SQL Server, so at most one retry"""
+    return min(max_retries, 1) + 1
+
+
+def _retry_delay(error: LockTimeoutError, attempt: int, attempts: int, employee_id: int, retry_delay_seconds: float) -> float:
+    """Jittered delay before the next lock attempt; re-raises once attempts are used up"""
+    if attempt < attempts - 1:
+        delay = retry_delay_seconds * random.uniform(0.5, 1.5)
+        logger.warning(f"Lock attempt {attempt + 1} timed out for employee {employee_id}, retrying in {delay:.2f}s: {str(error)}")
+        return delay
+    logger.error(f"All lock attempts failed for employee {employee_id} after {attempts} tries")
+    raise error
+
+
 class EmployeeLockManager:
     """
     Manages database-level locking for employee records to prevent race conditions.
@@ -36,47 +66,38 @@ class EmployeeLockManager:
         Args:
             db: Database session
             employee_id: ID of the employee to lock
-            timeout_seconds: Lock timeout in seconds (default: 30) - not used in SQL Server
+            timeout_seconds: Lock timeout in seconds (default: 30), enforced by
+                SQL Server through SET LOCK_TIMEOUT
         
         Returns:
             Employee object if found and locked, None if not found
             
         Raises:
-            LockingError: If lock acquisition fails or times out
+            LockTimeoutError: If SQL Server times out waiting for the lock
+            LockingError: If lock acquisition fails
         """
+        is_mssql = db.get_bind().dialect.name == "mssql"
         try:
             logger.info(f"Attempting to lock employee {employee_id} for update")
             
-            # First, check if employee exists without locking
-            check_query = text("""
-                SELECT EmployeeID FROM Employees 
-                WHERE EmployeeID = :employee_id AND IsActive = 1
-            """)
-            
-            check_result = db.execute(check_query, {
-                "employee_id": employee_id
-            }).fetchone()
-            
-            if not check_result:
-                logger.warning(f"Employee {employee_id} not found or not active")
-                return None
+            # Let the engine wait for the lock instead of polling from Python
+            if is_mssql:
+                db.execute(text(f"SET LOCK_TIMEOUT {int(timeout_seconds * 1000)}"))
             
-            # Now lock the employee record
-            query = text("""
-                SELECT * FROM Employees WITH (UPDLOCK, ROWLOCK)
-                WHERE EmployeeID = :employee_id AND IsActive = 1
-            """)
-            
-            result = db.execute(query, {
-                "employee_id": employee_id
-            }).fetchone()
+            # Lock the employee record in a single round trip. SQL Server ignores
+            # FOR UPDATE, so the lock is requested through a table hint there.
+            # populate_existing() refreshes an instance already in the identity map
+            # with the row as read under the lock, instead of keeping stale values.
+            employee = (
+                db.query(Employee)
+                .with_hint(Employee, "WITH (UPDLOCK, ROWLOCK)", "mssql")
+                .filter_by(EmployeeID=employee_id, IsActive=True)
+                .with_for_update(of=Employee)
+                .populate_existing()
+                .first()
+            )
             
-            if result:
-                # Convert result to Employee object
-                employee = Employee()
-                for column in Employee.__table__.columns:
-                    setattr(employee, column.name, getattr(result, column.name))
-                
+            if employee:
                 logger.info(f"Successfully locked employee {employee_id} for update")
                 return employee
             else:
@@ -88,10 +109,20 @@ class EmployeeLockManager:
             logger.error(error_msg)
             
             # SQL Server specific error handling
-            if "timeout" in str(e).lower() or "deadlock" in str(e).lower() or "blocked" in str(e).lower():
+            error_text = str(e).lower()
+            if "1222" in error_text or "lock request time out" in error_text:
+                raise LockTimeoutError(f"Lock acquisition timed out for employee {employee_id}. Please try again.")
+            elif "timeout" in error_text or "deadlock" in error_text or "blocked" in error_text:
                 raise LockingError(f"Lock acquisition timed out for employee {employee_id}. Please try again.")
             else:
                 raise LockingError(f"Database error while locking employee {employee_id}: {str(e)}")
+        finally:
+            # Restore the default (wait indefinitely) before the pooled connection is reused
+            if is_mssql:
+                try:
+                    db.execute(text("SET LOCK_TIMEOUT -1"))
+                except Exception as reset_error:
+                    logger.warning(f"Failed to reset lock timeout: {str(reset_error)}")
     
     @staticmethod
     def lock_employee_with_retry(
@@ -102,36 +133,57 @@ class EmployeeLockManager:
         timeout_seconds: int = 30
     ) -> Optional[Employee]:
         """
-        Lock an employee record with retry logic for handling temporary lock conflicts.
+        Lock an employee record, retrying once if the lock wait timed out.
+        
+        Waiting for the lock happens inside SQL Server (see lock_employee_for_update),
+        so only a lock timeout is retried, once and after a jittered delay.
         
         Args:
             db: Database session
             employee_id: ID of the employee to lock
-            max_retries: Maximum number of retry attempts (default: 3)
-            retry_delay_seconds: Delay between retries in seconds (default: 1.0)
+            max_retries: Maximum number of retry attempts (default: 3); at most one is used
+            retry_delay_seconds: Base delay before the retry in seconds (default: 1.0)
             timeout_seconds: Lock timeout in seconds (default: 30)
             
         Returns:
             Employee object if found and locked, None if not found
             
         Raises:
-            LockingError: If lock acquisition fails after all retries
+            LockingError: If lock acquisition fails
         """
-        import time
-        
-        for attempt in range(max_retries + 1):
+        attempts = _lock_attempts(max_retries)
+        for attempt in range(attempts):
             try:
                 return EmployeeLockManager.lock_employee_for_update(db, employee_id, timeout_seconds)
-                
-            except LockingError as e:
-                if attempt < max_retries:
-                    logger.warning(f"Lock attempt {attempt + 1} failed for employee {employee_id}, retrying in {retry_delay_seconds}s: {str(e)}")
-                    time.sleep(retry_delay_seconds)
-                    # Increase delay for next retry (exponential backoff)
-                    retry_delay_seconds *= 1.5
-                else:
-                    logger.error(f"All lock attempts failed for employee {employee_id} after {max_retries + 1} tries")
-                    raise e
+            except LockTimeoutError as e:
+                time.sleep(_retry_delay(e, attempt, attempts, employee_id, retry_delay_seconds))
+    
+    @staticmethod
+    async def lock_employee_with_retry_async(
+        db: Session, 
+        employee_id: int, 
+        max_retries: int = 3,
+        retry_delay_seconds: float = 1.0,
+        timeout_seconds: int = 30
+    ) -> Optional[Employee]:
+        """
+        Async variant of lock_employee_with_retry for coroutine callers.
+        
+        The blocking lock query runs in a worker thread and the delay before the
+        retry is awaited, so the event loop keeps serving other requests while
+        SQL Server waits for the lock.
+        
+        Raises:
+            LockingError: If lock acquisition fails
+        """
+        attempts = _lock_attempts(max_retries)
+        for attempt in range(attempts):
+            try:
+                return await anyio.to_thread.run_sync(
+                    EmployeeLockManager.lock_employee_for_update, db, employee_id, timeout_seconds
+                )
+            except LockTimeoutError as e:
+                await asyncio.sleep(_retry_delay(e, attempt, attempts, employee_id, retry_delay_seconds))
     
     @staticmethod
     @contextmanager
@@ -196,6 +248,9 @@ def with_employee_lock(
     """
     Decorator for functions that require employee locking.
     
+    Both plain and ``async def`` methods can be decorated; the wrapper is of
+    the same kind as the decorated function.
+    
     Usage:
         @with_employee_lock()
         def upload_profile_picture(self, db: Session, employee_id: int, ...):
@@ -208,16 +263,71 @@ def with_employee_lock(
         timeout_seconds: Lock timeout in seconds
     """
     def decorator(func: Callable) -> Callable:
-        async def wrapper(self, db: Session, employee_id: int, *args, **kwargs):
-            with EmployeeLockManager.employee_lock_context(
-                db, employee_id, max_retries, retry_delay_seconds, timeout_seconds
-            ) as employee:
-                if not employee:
-                    raise HTTPException(status_code=404, detail="Employee not found")
+        def already_locked(db: Session, employee_id: int, kwargs: dict) -> bool:
+            # Already locked by the caller or an enclosing decorated call
+            locked = kwargs.get('locked_employee')
+            if locked is not None and locked.EmployeeID == employee_id:
+                return True
+            if (id(db), employee_id) in _locked_employees.get():
+                kwargs['locked_employee'] = db.get(Employee, employee_id)
+                return True
+            return False
+        
+        def lock_failed(employee_id: int, e: Exception) -> HTTPException:
+            if isinstance(e, LockingError):
+                logger.error(f"Lock acquisition failed for employee {employee_id}: {str(e)}")
+                return HTTPException(
+                    status_code=409, 
+                    detail="Employee record is currently being modified by another request. Please try again in a few moments."
+                )
+            logger.error(f"Unexpected error during employee locking for {employee_id}: {str(e)}")
+            return HTTPException(status_code=500, detail="An unexpected error occurred during employee locking")
+        
+        def hold(db: Session, employee_id: int, employee: Optional[Employee], kwargs: dict):
+            if not employee:
+                raise HTTPException(status_code=404, detail="Employee not found")
+            
+            # Add the locked employee to kwargs for use in the function.
+            # The lock is released when the database transaction ends.
+            kwargs['locked_employee'] = employee
+            return _locked_employees.set(_locked_employees.get() | {(id(db), employee_id)})
+        
+        if inspect.iscoroutinefunction(func):
+            @wraps(func)
+            async def async_wrapper(self, db: Session, employee_id: int, *args, **kwargs):
+                if already_locked(db, employee_id, kwargs):
+                    return await func(self, db, employee_id, *args, **kwargs)
+                try:
+                    employee = await EmployeeLockManager.lock_employee_with_retry_async(
+                        db, employee_id, max_retries, retry_delay_seconds, timeout_seconds
+                    )
+                except Exception as e:
+                    raise lock_failed(employee_id, e)
                 
-                # Add the locked employee to kwargs for use in the function
-                kwargs['locked_employee'] = employee
-                return await func(self, db, employee_id, *args, **kwargs)
+                token = hold(db, employee_id, employee, kwargs)
+                try:
+                    return await func(self, db, employee_id, *args, **kwargs)
+                finally:
+                    _locked_employees.reset(token)
+            
+            return async_wrapper
+        
+        @wraps(func)
+        def wrapper(self, db: Session, employee_id: int, *args, **kwargs):
+            if already_locked(db, employee_id, kwargs):
+                return func(self, db, employee_id, *args, **kwargs)
+            try:
+                employee = EmployeeLockManager.lock_employee_with_retry(
+                    db, employee_id, max_retries, retry_delay_seconds, timeout_seconds
+                )
+            except Exception as e:
+                raise lock_failed(employee_id, e)
+            
+            token = hold(db, employee_id, employee, kwargs)
+            try:
+                return func(self, db, employee_id, *args, **kwargs)
+            finally:
+                _locked_employees.reset(token)
         
         return wrapper
-    return decorator 
\ No newline at end of file
+    return decorator
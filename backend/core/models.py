@@ -1,19 +1,28 @@
-# Import all models to ensure they are registered with SQLAlchemy
-from api.employee.models import *
-from api.department.models import *
-from api.team.models import *
-from api.location.models import *
-from api.leave.models import *
-from api.timesheet.models import *
-from api.asset.models import *
-from api.feedback.models import *
-from api.auth.models import *
-from api.comments.models import *
+# Import all models to ensure they are registered with SQLAlchemy. Only the
+# mapper registration is needed, so the modules are imported without copying
+# their names into this namespace.
+import importlib
+
+MODEL_MODULES = (
+    "api.employee.models",
+    "api.department.models",
+    "api.team.models",
+    "api.location.models",
+    "api.leave.models",
+    "api.timesheet.models",
+    "api.asset.models",
+    "api.feedback.models",
+    "api.auth.models",
+    "api.comments.models",
+)
+
+for _module_name in MODEL_MODULES:
+    importlib.import_module(_module_name)
 
 # -------------------------------------------------------------------------
 # Notification subsystem models (SQLAlchemy ORM)
 # -------------------------------------------------------------------------
-from sqlalchemy import Column, String, Text, DateTime, Boolean, Integer, ForeignKey, CheckConstraint, Index, Time
+from sqlalchemy import Column, String, Text, DateTime, Boolean, Integer, ForeignKey, CheckConstraint, Index, Time, Uuid, text
 from sqlalchemy.orm import relationship
 from sqlalchemy.sql import func
 from core.database import Base
@@ -22,7 +31,9 @@ from core.database import Base
 class Notification(Base):
     __tablename__ = "Notifications"
 
-    Id = Column(String(36), primary_key=True)
+    # UUID keys are stored as 16-byte UNIQUEIDENTIFIER on SQL Server and exposed as strings;
+    # existing NVARCHAR(36) schemas are converted by scripts/migrate_notification_uuid_keys.py
+    Id = Column(Uuid(as_uuid=False), primary_key=True)
     UserID = Column(String(50), ForeignKey("Users.UserID"), nullable=False)
     Type = Column(String(50), nullable=False)
     Category = Column(String(50), nullable=False)
@@ -50,7 +61,15 @@ class Notification(Base):
 
     __table_args__ = (
         CheckConstraint("Priority IN ('low','normal','high','urgent')", name="CHK_Notifications_Priority"),
-        Index("IX_Notifications_UserRead", "UserID", "IsRead"),
+        # Unread lookups only touch the small set of rows that have not been read yet;
+        # Id is the clustered key, so the index already carries it
+        Index(
+            "IX_Notifications_Unread_Filtered",
+            "UserID",
+            "CreatedAt",
+            mssql_where=text("IsRead = 0"),
+            mssql_include=["Type", "Title"],
+        ),
         Index("IX_Notifications_UserType", "UserID", "Type"),
         Index("IX_Notifications_CreatedAt", "CreatedAt"),
     )
@@ -59,8 +78,8 @@ class Notification(Base):
 class NotificationDelivery(Base):
     __tablename__ = "NotificationDeliveries"
 
-    Id = Column(String(36), primary_key=True)
-    NotificationID = Column(String(36), ForeignKey("Notifications.Id", ondelete="CASCADE"), nullable=False)
+    Id = Column(Uuid(as_uuid=False), primary_key=True)
+    NotificationID = Column(Uuid(as_uuid=False), ForeignKey("Notifications.Id", ondelete="CASCADE"), nullable=False)
     Channel = Column(String(20), nullable=False)
     Status = Column(String(10), nullable=False, default="pending")
     SentAt = Column(DateTime)
@@ -103,8 +122,8 @@ class UserNotificationPreference(Base):
 class LearningNotification(Base):
     __tablename__ = "LearningNotifications"
 
-    Id = Column(String(36), primary_key=True)
-    NotificationID = Column(String(36), ForeignKey("Notifications.Id", ondelete="CASCADE"), nullable=False)
+    Id = Column(Uuid(as_uuid=False), primary_key=True)
+    NotificationID = Column(Uuid(as_uuid=False), ForeignKey("Notifications.Id", ondelete="CASCADE"), nullable=False)
     CourseID = Column(Integer, ForeignKey("Courses.CourseID"), nullable=False)
     ActionType = Column(String(20), nullable=False)
     CourseName = Column(String(200))
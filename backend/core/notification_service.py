@@ -1,7 +1,7 @@
 import uuid
-from typing import List
-from sqlalchemy.orm import Session
-from sqlalchemy import and_, desc
+from typing import List, Tuple
+from sqlalchemy.orm import Session, selectinload
+from sqlalchemy import and_, case, desc, func, literal
 from datetime import datetime
 
 from core.models import Notification, NotificationDelivery, LearningNotification
@@ -12,9 +12,9 @@ class NotificationService:
     def __init__(self, db: Session):
         self.db = db
 
-    async def create_notification(self, data: NotificationCreate) -> Notification:
-        """Create a new notification with desktop delivery record."""
-        # Create notification
+    @staticmethod
+    def _build_notification(data: NotificationCreate, created_at: datetime) -> Tuple[Notification, NotificationDelivery]:
+        """Build a notification and its desktop delivery record without persisting them."""
         notification = Notification(
             Id=str(uuid.uuid4()),
             UserID=data.user_id,
@@ -26,12 +26,9 @@ class NotificationService:
             Metadata=data.metadata,
             ExpiresAt=data.expires_at,
             IsRead=False,
-            CreatedAt=datetime.utcnow()
+            CreatedAt=created_at
         )
         
-        self.db.add(notification)
-        
-        # Create desktop delivery record
         delivery = NotificationDelivery(
             Id=str(uuid.uuid4()),
             NotificationID=notification.Id,
@@ -39,32 +36,96 @@ class NotificationService:
             Status='pending',
             RetryCount=0,
             MaxRetries=3,
-            CreatedAt=datetime.utcnow()
+            CreatedAt=created_at
         )
         
-        self.db.add(delivery)
+        return notification, delivery
+
+    def create_notification(self, data: NotificationCreate) -> Notification:
+        """Create a new notification with desktop delivery record."""
+        notifications = self.create_notifications_bulk([data])
+        return notifications[0]
+
+    def create_notifications_bulk(self, data_list: List[NotificationCreate]) -> List[Notification]:
+        """Create several notifications with their desktop delivery records in one transaction."""
+        created_at = datetime.utcnow()
+        notifications = []
+        deliveries = []
+        
+        for data in data_list:
+            notification, delivery = self._build_notification(data, created_at)
+            notifications.append(notification)
+            deliveries.append(delivery)
+        
+        # All rows carry client-side keys, so the flush batches each table into one executemany
+        self.db.add_all(notifications)
+        self.db.add_all(deliveries)
         self.db.commit()
-        self.db.refresh(notification)
         
-        return notification
+        return notifications
 
-    async def list_user_notifications(
+    def list_user_notifications(
         self,
         user_id: str,
         limit: int = 50,
         offset: int = 0,
-        unread_only: bool = False
+        unread_only: bool = False,
+        include_related: bool = False
     ) -> List[Notification]:
-        """List notifications for a user with optional filtering."""
+        """
+        List notifications for a user with optional filtering.
+        
+        With ``include_related`` the deliveries and learning details of the whole
+        page are loaded up front (one extra query each) instead of lazily per row.
+        """
         query = self.db.query(Notification).filter(Notification.UserID == user_id)
         
+        if include_related:
+            query = query.options(
+                selectinload(Notification.deliveries),
+                selectinload(Notification.learning_notification)
+            )
+        
         if unread_only:
             query = query.filter(Notification.IsRead == False)
         
         notifications = query.order_by(desc(Notification.CreatedAt)).offset(offset).limit(limit).all()
         return notifications
 
-    async def mark_as_read(self, notification_id: str, user_id: str) -> bool:
+    def list_with_counts(
+        self,
+        user_id: str,
+        limit: int = 50,
+        offset: int = 0
+    ) -> Tuple[List[Notification], int, int]:
+        """List a page of notifications together with the user's total and unread counts."""
+        total = func.count().over().label("total")
+        unread = func.sum(case((Notification.IsRead == False, 1), else_=0)).over().label("unread")
+        
+        # Window aggregates are evaluated before OFFSET/FETCH, so every row carries the full counts
+        rows = (
+            self.db.query(Notification, total, unread)
+            .filter(Notification.UserID == user_id)
+            .order_by(desc(Notification.CreatedAt))
+            .offset(offset)
+            .limit(limit)
+            .all()
+        )
+        
+        if rows:
+            return [row[0] for row in rows], rows[0].total, rows[0].unread or 0
+        
+        if offset == 0:
+            return [], 0, 0
+        
+        # Page past the end: no row to read the counts from, so aggregate them directly
+        total_count, unread_count = self.db.query(
+            func.count(),
+            func.sum(case((Notification.IsRead == False, 1), else_=0))
+        ).filter(Notification.UserID == user_id).one()
+        return [], total_count, unread_count or 0
+
+    def mark_as_read(self, notification_id: str, user_id: str) -> bool:
         """Mark a notification as read for the specified user."""
         notification = self.db.query(Notification).filter(
             and_(
@@ -82,7 +143,7 @@ class NotificationService:
         self.db.commit()
         return True
 
-    async def unread_count(self, user_id: str) -> int:
+    def unread_count(self, user_id: str) -> int:
         """Get count of unread notifications for a user."""
         count = self.db.query(Notification).filter(
             and_(
@@ -93,7 +154,36 @@ class NotificationService:
         
         return count
 
-    async def create_learning_notification(
+    def has_unread(self, user_id: str) -> bool:
+        """Check whether a user has any unread notification."""
+        # SELECT TOP 1 1 ... stops at the first matching index entry
+        return self.db.query(literal(1)).filter(
+            and_(
+                Notification.UserID == user_id,
+                Notification.IsRead == False
+            )
+        ).first() is not None
+
+    def purge_expired(self, now: datetime = None) -> int:
+        """
+        Delete notifications whose ExpiresAt has passed.
+        
+        Run periodically by the expiry purger in core.notification_worker. Delivery
+        and module-specific rows are removed by the ON DELETE CASCADE foreign keys.
+        Returns the number of notifications deleted.
+        """
+        now = now or datetime.utcnow()
+        deleted = self.db.query(Notification).filter(
+            and_(
+                Notification.ExpiresAt.isnot(None),
+                Notification.ExpiresAt < now
+            )
+        ).delete(synchronize_session=False)
+        
+        self.db.commit()
+        return deleted
+
+    def create_learning_notification(
         self,
         learning_data: LearningNotificationCreate
     ) -> LearningNotification:
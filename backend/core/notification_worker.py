@@ -1,54 +1,261 @@
+import asyncio
 import logging
+import os
+import anyio
 from datetime import datetime
+from typing import List, Optional
+from sqlalchemy import update
+from sqlalchemy.exc import NoSuchModuleError
 from sqlalchemy.orm import Session
 from core.models import NotificationDelivery
-from core.database import SessionLocal
+from core.database import get_async_sessionmaker, get_db_session
+from core.notification_service import NotificationService
 
 logger = logging.getLogger(__name__)
 
 
+def _mark_delivered(delivery_ids: List[str]):
+    """Build the conditional UPDATE that moves pending deliveries to 'delivered'."""
+    now = datetime.utcnow()
+    return (
+        update(NotificationDelivery)
+        .where(
+            NotificationDelivery.Id.in_(delivery_ids),
+            NotificationDelivery.Status == 'pending'
+        )
+        .values(Status='delivered', SentAt=now, DeliveredAt=now)
+    )
+
+
+def _mark_delivered_sync(delivery_ids: List[str]) -> int:
+    """Run the delivery UPDATE on the sync engine; returns the rows updated."""
+    with get_db_session() as db:
+        return db.execute(_mark_delivered(delivery_ids)).rowcount
+
+
+# Set once the async driver turns out to be missing, so later deliveries go
+# straight to the sync engine
+_async_driver_missing = False
+
+
+async def _execute_mark_delivered(delivery_ids: List[str]) -> int:
+    """
+    Run the delivery UPDATE without blocking the event loop; returns the rows updated.
+    
+    The async engine is tried first. If it fails, the UPDATE is run on the
+    sync engine in a worker thread, so deliveries don't depend on the async
+    driver alone.
+    """
+    global _async_driver_missing
+    if not _async_driver_missing:
+        try:
+            async with get_async_sessionmaker()() as async_db:
+                result = await async_db.execute(_mark_delivered(delivery_ids))
+                await async_db.commit()
+            return result.rowcount
+        except (ImportError, NoSuchModuleError) as e:
+            _async_driver_missing = True
+            logger.warning(f"Async database driver unavailable, delivering on the sync engine: {str(e)}")
+        except Exception as e:
+            logger.warning(f"Async delivery update failed, retrying on the sync engine: {str(e)}")
+    return await anyio.to_thread.run_sync(_mark_delivered_sync, delivery_ids)
+
+
 async def deliver_desktop_notification(delivery_id: str, db: Session = None):
     """
     Simulate desktop notification delivery by updating status from 'pending' to 'delivered'.
     
     Args:
         delivery_id: The ID of the NotificationDelivery record
-        db: Database session (optional - will create new session if None)
-    """
-    # Create new database session if none provided
-    if db is None:
-        db = SessionLocal()
-        should_close_session = True
-    else:
-        should_close_session = False
-    
+        db: Database session (optional - if None, the update runs without blocking
+            the event loop, see _execute_mark_delivered)
+    """
     try:
-        # Fetch the NotificationDelivery row
-        delivery = db.query(NotificationDelivery).filter(
-            NotificationDelivery.Id == delivery_id
-        ).first()
-        
-        if not delivery:
-            logger.warning(f"NotificationDelivery with ID {delivery_id} not found")
-            return
+        # Transition pending -> delivered in one conditional UPDATE; the status
+        # predicate makes concurrent deliveries of the same row a no-op
+        if db is None:
+            rowcount = await _execute_mark_delivered([delivery_id])
+        else:
+            rowcount = db.execute(_mark_delivered([delivery_id])).rowcount
+            db.commit()
         
-        if delivery.Status != 'pending':
-            logger.info(f"NotificationDelivery {delivery_id} already processed (status: {delivery.Status})")
+        if rowcount == 0:
+            logger.info(f"NotificationDelivery {delivery_id} not found or already processed")
             return
         
-        # Update status and timestamps
-        now = datetime.utcnow()
-        delivery.Status = 'delivered'
-        delivery.SentAt = now
-        delivery.DeliveredAt = now
-        
-        db.commit()
         logger.info(f"Successfully delivered notification {delivery_id}")
         
     except Exception as e:
         logger.error(f"Failed to deliver notification {delivery_id}: {str(e)}")
         # Don't re-raise - background tasks should be fire-and-forget
-    finally:
-        # Close session if we created it
-        if should_close_session and db:
-            db.close() 
\ No newline at end of file
+
+
+# -------------------------------------------------------------------------
+# Batched delivery: deliveries queued within BATCH_MS of each other are
+# marked delivered with a single UPDATE ... WHERE Id IN (...).
+# -------------------------------------------------------------------------
+MAX_BATCH = 500
+BATCH_MS = 50
+MAX_DELIVERY_ATTEMPTS = 3
+RETRY_DELAY_S = 0.5
+
+# Queued after the last delivery id to make the worker flush and exit
+_STOP = object()
+
+_delivery_queue: Optional[asyncio.Queue] = None
+_batcher_task: Optional[asyncio.Task] = None
+_batcher_loop: Optional[asyncio.AbstractEventLoop] = None
+
+
+def enqueue_desktop_delivery(delivery_id: str) -> bool:
+    """
+    Queue a delivery for the batching worker.
+    
+    Safe to call from sync endpoints running in the threadpool.
+    
+    Returns:
+        False when the batching worker is not running, so the caller can
+        fall back to deliver_desktop_notification
+    """
+    if _batcher_task is None or _batcher_task.done():
+        return False
+    _batcher_loop.call_soon_threadsafe(_delivery_queue.put_nowait, delivery_id)
+    return True
+
+
+async def _deliver_batch(delivery_ids: List[str]) -> bool:
+    """Mark a batch of pending deliveries as delivered in one UPDATE."""
+    try:
+        rowcount = await _execute_mark_delivered(delivery_ids)
+        logger.info(f"Delivered {rowcount} of {len(delivery_ids)} queued notifications")
+        return True
+    except Exception as e:
+        logger.error(f"Failed to deliver batch of {len(delivery_ids)} notifications: {str(e)}")
+        return False
+
+
+async def _deliver_with_retry(delivery_ids: List[str]) -> None:
+    """
+    Deliver a batch, retrying failures with exponential backoff.
+    
+    The UPDATE only touches 'pending' rows, so a retry after a partial
+    failure is harmless. Ids that still fail are left 'pending'.
+    """
+    for attempt in range(MAX_DELIVERY_ATTEMPTS):
+        if attempt:
+            await asyncio.sleep(RETRY_DELAY_S * 2 ** (attempt - 1))
+        if await _deliver_batch(delivery_ids):
+            return
+    logger.error(
+        f"Giving up on {len(delivery_ids)} notifications after "
+        f"{MAX_DELIVERY_ATTEMPTS} attempts; they remain pending"
+    )
+
+
+async def _run_delivery_batcher() -> None:
+    """Drain the queue, coalescing up to MAX_BATCH ids or BATCH_MS of arrivals per UPDATE."""
+    loop = asyncio.get_running_loop()
+    stopping = False
+    while not stopping:
+        delivery_id = await _delivery_queue.get()
+        if delivery_id is _STOP:
+            break
+        delivery_ids = [delivery_id]
+        deadline = loop.time() + BATCH_MS / 1000
+        
+        while len(delivery_ids) < MAX_BATCH:
+            remaining = deadline - loop.time()
+            if remaining <= 0:
+                break
+            try:
+                delivery_id = await asyncio.wait_for(_delivery_queue.get(), remaining)
+            except asyncio.TimeoutError:
+                break
+            if delivery_id is _STOP:
+                stopping = True
+                break
+            delivery_ids.append(delivery_id)
+        
+        # Flush the batch in hand even when stopping
+        await _deliver_with_retry(delivery_ids)
+
+
+async def start_delivery_batcher() -> None:
+    """Start the batching worker on the running event loop."""
+    global _delivery_queue, _batcher_task, _batcher_loop
+    if _batcher_task is not None and not _batcher_task.done():
+        return
+    _batcher_loop = asyncio.get_running_loop()
+    _delivery_queue = asyncio.Queue()
+    _batcher_task = asyncio.create_task(_run_delivery_batcher())
+    logger.info("Notification delivery batcher started")
+
+
+async def stop_delivery_batcher() -> None:
+    """Let the worker flush everything queued, then stop it."""
+    global _batcher_task
+    if _batcher_task is None:
+        return
+    # New deliveries fall back to deliver_desktop_notification from here on
+    task, _batcher_task = _batcher_task, None
+    _delivery_queue.put_nowait(_STOP)
+    await task
+    
+    # Ids that were scheduled onto the loop after the stop marker
+    pending_ids = []
+    while not _delivery_queue.empty():
+        pending_ids.append(_delivery_queue.get_nowait())
+    for start in range(0, len(pending_ids), MAX_BATCH):
+        await _deliver_with_retry(pending_ids[start:start + MAX_BATCH])
+    logger.info("Notification delivery batcher stopped")
+
+
+# -------------------------------------------------------------------------
+# Periodic purge of expired notifications
+# -------------------------------------------------------------------------
+PURGE_INTERVAL_SECONDS = float(os.getenv("NOTIFICATION_PURGE_INTERVAL_SECONDS", "3600"))
+
+_purge_task: Optional[asyncio.Task] = None
+_purge_stop: Optional[asyncio.Event] = None
+
+
+def _purge_expired_notifications() -> int:
+    """Delete expired notifications in a short-lived session."""
+    with get_db_session() as db:
+        return NotificationService(db).purge_expired()
+
+
+async def _run_expiry_purger() -> None:
+    """Purge expired notifications every PURGE_INTERVAL_SECONDS until stopped."""
+    while not _purge_stop.is_set():
+        try:
+            deleted = await anyio.to_thread.run_sync(_purge_expired_notifications)
+            if deleted:
+                logger.info(f"Purged {deleted} expired notifications")
+        except Exception as e:
+            logger.error(f"Failed to purge expired notifications: {str(e)}")
+        try:
+            await asyncio.wait_for(_purge_stop.wait(), PURGE_INTERVAL_SECONDS)
+        except asyncio.TimeoutError:
+            pass
+
+
+async def start_expiry_purger() -> None:
+    """Start the periodic purge on the running event loop."""
+    global _purge_task, _purge_stop
+    if _purge_task is not None and not _purge_task.done():
+        return
+    _purge_stop = asyncio.Event()
+    _purge_task = asyncio.create_task(_run_expiry_purger())
+    logger.info("Notification expiry purger started")
+
+
+async def stop_expiry_purger() -> None:
+    """Stop the periodic purge once any purge in progress has finished."""
+    global _purge_task
+    if _purge_task is None:
+        return
+    task, _purge_task = _purge_task, None
+    _purge_stop.set()
+    await task
+    logger.info("Notification expiry purger stopped")
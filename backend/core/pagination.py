@@ -2,6 +2,7 @@
 Pagination utilities for consistent API responses
 """
 
+from functools import lru_cache
 from typing import List, TypeVar, Generic
 from pydantic import BaseModel
 from sqlalchemy.orm import Query
@@ -18,12 +19,32 @@ class PaginatedResponse(BaseModel, Generic[T]):
     has_next: bool
     has_previous: bool
 
+    @classmethod
+    def from_page(cls, items: List, total_count: int, page: int, size: int) -> "PaginatedResponse[T]":
+        """
+        Build a response for items that were already validated or loaded from the database.
+        
+        Uses ``model_construct`` so the items are not validated a second time.
+        """
+        return cls.model_construct(**create_list_response(items, total_count, page, size))
+
+@lru_cache(maxsize=128)
+def _order_clause(column, descending: bool):
+    """
+    Ordering clause for a column, built once per (column, direction).
+    
+    SQLAlchemy already caches the compiled SQL of each statement shape, so
+    reusing the clause object is all that is left to save per call.
+    """
+    return desc(column) if descending else column
+
 def paginate_query(
     query: Query,
     skip: int = 0,
     limit: int = 100,
     order_by_column=None,
-    order_desc: bool = True
+    order_desc: bool = True,
+    with_total: bool = False
 ) -> dict:
     """
     Paginate a SQLAlchemy query and return standardized response
@@ -34,26 +55,31 @@ def paginate_query(
         limit: Number of items to return
         order_by_column: Column to order by (defaults to first primary key)
         order_desc: Whether to order descending (default True)
+        with_total: Run a COUNT(*) query for total_count (default False);
+            without it total_count is None and has_next comes from one extra row
     
     Returns:
         dict with paginated results and metadata
     """
-    # Get total count before pagination
-    total_count = query.count()
+    # Get total count before pagination, only when the caller needs it
+    total_count = query.count() if with_total else None
     
     # Apply ordering
-    if order_by_column:
-        if order_desc:
-            query = query.order_by(desc(order_by_column))
-        else:
-            query = query.order_by(order_by_column)
+    if order_by_column is not None:
+        query = query.order_by(_order_clause(order_by_column, order_desc))
     
     # Get paginated results
-    items = query.offset(skip).limit(limit).all()
+    if with_total:
+        items = query.offset(skip).limit(limit).all()
+        has_next = (skip + limit) < total_count
+    else:
+        # Fetch one extra row to learn whether another page exists
+        items = query.offset(skip).limit(limit + 1).all()
+        has_next = len(items) > limit
+        items = items[:limit]
     
     # Calculate pagination info
     page = (skip // limit) + 1 if limit > 0 else 1
-    has_next = (skip + limit) < total_count
     has_previous = skip > 0
     
     return {
@@ -65,6 +91,42 @@ def paginate_query(
         "has_previous": has_previous
     }
 
+def paginate_keyset(
+    query: Query,
+    cursor=None,
+    limit: int = 100,
+    key_column=None
+) -> dict:
+    """
+    Paginate a SQLAlchemy query by key instead of offset (newest first)
+    
+    Each page is fetched with ``key_column < cursor``, so the cost of a page
+    does not grow with its depth and no COUNT(*) query is needed.
+    
+    Args:
+        query: SQLAlchemy query to paginate
+        cursor: Key value of the last item of the previous page (None for the first page)
+        limit: Number of items to return
+        key_column: Indexed, unique and ordered column used as the cursor
+    
+    Returns:
+        dict with paginated results and the cursor of the next page
+    """
+    if cursor is not None:
+        query = query.filter(key_column < cursor)
+    
+    # Fetch one extra row to learn whether another page exists
+    items = query.order_by(_order_clause(key_column, True)).limit(limit + 1).all()
+    has_next = len(items) > limit
+    items = items[:limit]
+    
+    return {
+        "items": items,
+        "next_cursor": getattr(items[-1], key_column.key) if has_next else None,
+        "size": limit,
+        "has_next": has_next
+    }
+
 def create_list_response(
     items: List,
     total_count: int,
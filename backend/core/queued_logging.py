@@ -0,0 +1,60 @@
+"""
+Queued loggers for hot paths.
+
+Records are put on a queue by the calling thread and formatted and written by
+a background QueueListener, so request handlers never block on log I/O. The
+application starts and stops the listeners from its lifespan.
+"""
+
+import logging
+import queue
+import threading
+from logging.handlers import QueueHandler, QueueListener
+from typing import Dict
+
+# Logger name -> listener writing that logger's queued records
+_listeners: Dict[str, QueueListener] = {}
+_running: Dict[str, bool] = {}
+_lock = threading.Lock()
+
+def get_queued_logger(name: str, fmt: str, level: int = logging.INFO) -> logging.Logger:
+    """
+    Get a non-propagating logger whose records go through a queue.
+
+    Records logged before start_queued_logging() wait in the queue until the
+    listener starts.
+    """
+    logger = logging.getLogger(name)
+    with _lock:
+        if name not in _listeners:
+            log_queue = queue.SimpleQueue()
+            logger.setLevel(level)
+            logger.propagate = False
+            logger.addHandler(QueueHandler(log_queue))
+            handler = logging.StreamHandler()
+            handler.setFormatter(logging.Formatter(fmt))
+            _listeners[name] = QueueListener(log_queue, handler)
+            _running[name] = False
+    return logger
+
+def start_queued_logging() -> None:
+    """Start the background listener of every queued logger."""
+    with _lock:
+        for name, listener in _listeners.items():
+            if not _running[name]:
+                listener.start()
+                _running[name] = True
+
+def stop_queued_logging() -> None:
+    """Write out the queued records and stop every listener."""
+    with _lock:
+        for name, listener in _listeners.items():
+            if _running[name]:
+                listener.stop()
+                _running[name] = False
+
+__all__ = [
+    "get_queued_logger",
+    "start_queued_logging",
+    "stop_queued_logging"
+]
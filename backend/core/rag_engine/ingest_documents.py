@@ -1,6 +1,16 @@
+import asyncio
+import glob
+import hashlib
 import os
+import random
+import uuid
+import faiss
+import numpy as np
+from concurrent.futures import ProcessPoolExecutor
 from dotenv import load_dotenv
+from openai import RateLimitError
 from langchain_community.document_loaders import TextLoader
+from langchain_community.docstore.in_memory import InMemoryDocstore
 from langchain_community.vectorstores import FAISS
 from langchain_openai import AzureOpenAIEmbeddings
 from langchain.text_splitter import RecursiveCharacterTextSplitter
@@ -8,22 +18,137 @@ from langchain.text_splitter import RecursiveCharacterTextSplitter
 # Load .env
 load_dotenv()
 
+# Texts sent per embedding request; ada-002 accepts up to 2048 inputs per call
+EMBED_BATCH_SIZE = 256
+# Embedding requests kept in flight at once
+EMBED_CONCURRENCY = 6
+# Rate-limited requests are retried with exponential backoff (seconds) unless
+# the service says how long to wait
+EMBED_MAX_RETRIES = 6
+EMBED_BACKOFF_BASE = 1.0
+EMBED_BACKOFF_MAX = 60.0
+
+# IVF-PQ settings; below IVFPQ_MIN_VECTORS there isn't enough data to train
+# the quantizers and the exact flat index is both smaller and faster. FAISS
+# wants ~39 training points per centroid, and each PQ sub-quantizer has
+# 2**PQ_NBITS centroids, which outnumber the IVF lists.
+IVF_NLIST = 64
+PQ_M = 48
+PQ_NBITS = 8
+IVF_NPROBE = 8
+IVFPQ_MIN_VECTORS = max(IVF_NLIST, 2 ** PQ_NBITS) * 39
+
+
+def _retry_after(error):
+    """Seconds the service asked us to wait before retrying, if it said."""
+    response = getattr(error, "response", None)
+    headers = response.headers if response is not None else {}
+    try:
+        if "retry-after-ms" in headers:
+            return float(headers["retry-after-ms"]) / 1000
+        if "retry-after" in headers:
+            return float(headers["retry-after"])
+    except ValueError:
+        pass
+    return None
+
+
+async def _aembed_batch(embeddings, batch):
+    """Embed one batch, backing off on rate limits and splitting only oversized requests."""
+    # Small jitter so concurrent requests don't hit the rate limiter together
+    await asyncio.sleep(random.uniform(0, 0.05))
+    for attempt in range(EMBED_MAX_RETRIES + 1):
+        try:
+            return await embeddings.aembed_documents(batch)
+        except RateLimitError as e:
+            # A request over the per-minute token budget never succeeds as is
+            if "too large" in str(e).lower() and len(batch) > 1:
+                mid = len(batch) // 2
+                print(f"⚠️ Request too large, retrying with batch size {mid}")
+                return await _aembed_batch(embeddings, batch[:mid]) + await _aembed_batch(embeddings, batch[mid:])
+            if attempt == EMBED_MAX_RETRIES:
+                raise
+            delay = _retry_after(e)
+            if delay is None:
+                delay = min(EMBED_BACKOFF_MAX, EMBED_BACKOFF_BASE * 2 ** attempt) * random.uniform(0.5, 1)
+            print(f"⚠️ Rate limited, retrying in {delay:.1f}s")
+            await asyncio.sleep(delay)
+
+
+async def aembed_in_batches(embeddings, texts, batch_size=EMBED_BATCH_SIZE, concurrency=EMBED_CONCURRENCY):
+    """Embed texts in batches with up to `concurrency` requests in flight, keeping input order."""
+    sem = asyncio.Semaphore(concurrency)
+    batches = [texts[i:i + batch_size] for i in range(0, len(texts), batch_size)]
+
+    async def run(i, batch):
+        async with sem:
+            return i, await _aembed_batch(embeddings, batch)
+
+    results = await asyncio.gather(*[run(i, b) for i, b in enumerate(batches)])
+    results.sort(key=lambda r: r[0])
+    return [vec for _, vecs in results for vec in vecs]
+
+
+def _wrap_index(index, docs, embeddings):
+    """Wrap a populated FAISS index and its source chunks in a LangChain store."""
+    ids = [str(uuid.uuid4()) for _ in docs]
+    return FAISS(
+        embedding_function=embeddings,
+        index=index,
+        docstore=InMemoryDocstore(dict(zip(ids, docs))),
+        index_to_docstore_id=dict(enumerate(ids)),
+    )
+
+
+def build_flat_store(docs, data, embeddings):
+    """Build a FAISS store backed by an exact flat index."""
+    index = faiss.IndexFlatL2(data.shape[1])
+    index.add(data)
+    return _wrap_index(index, docs, embeddings)
+
+
+def build_quantized_store(docs, data, embeddings):
+    """Build a FAISS store backed by a trained IVF-PQ index."""
+    dim = data.shape[1]
+    quantizer = faiss.IndexFlatL2(dim)
+    index = faiss.IndexIVFPQ(quantizer, dim, IVF_NLIST, PQ_M, PQ_NBITS)
+    index.train(data)
+    index.add(data)
+    index.nprobe = IVF_NPROBE
+    return _wrap_index(index, docs, embeddings)
+
+
+DOCS_GLOB = "./core/rag_engine/docs/*.txt"
+
+
+def _split_one(path):
+    """Load and split a single document file into chunks."""
+    documents = TextLoader(path, encoding="utf-8").load()
+    text_splitter = RecursiveCharacterTextSplitter(chunk_size=150, chunk_overlap=20)
+    return text_splitter.split_documents(documents)
+
+
+def split_documents(paths):
+    """Split document files into chunks, one worker process per file when there are several."""
+    if len(paths) == 1:
+        return _split_one(paths[0])
+    with ProcessPoolExecutor() as ex:
+        chunk_lists = list(ex.map(_split_one, paths))
+    return [chunk for chunks in chunk_lists for chunk in chunks]
+
+
 def create_vector_store():
     """Create FAISS vector store from helpdesk documents."""
     
     # Check if documents exist
-    docs_path = "./core/rag_engine/docs/helpdesk_faq.txt"
-    if not os.path.exists(docs_path):
-        print(f"❌ Document not found: {docs_path}")
+    paths = sorted(glob.glob(DOCS_GLOB))
+    if not paths:
+        print(f"❌ No documents found: {DOCS_GLOB}")
         return False
     
     try:
-        # Load and split the document
-        loader = TextLoader(docs_path, encoding="utf-8")
-        documents = loader.load()
-
-        text_splitter = RecursiveCharacterTextSplitter(chunk_size=150, chunk_overlap=20)
-        docs = text_splitter.split_documents(documents)
+        # Load and split the documents
+        docs = split_documents(paths)
 
         print(f"✅ Loaded {len(docs)} document chunks")
 
@@ -38,8 +163,28 @@ def create_vector_store():
 
         print("✅ Embeddings model initialized")
 
+        # Embed chunks in large concurrent batches, then build the vector store from the vectors
+        texts = [d.page_content for d in docs]
+        # Repeated boilerplate chunks are embedded once and fanned back out
+        unique = {}
+        order = []
+        for t in texts:
+            h = hashlib.blake2b(t.encode(), digest_size=16).digest()
+            order.append(h)
+            unique.setdefault(h, t)
+        unique_vecs = asyncio.run(aembed_in_batches(embeddings, list(unique.values())))
+        vec_map = dict(zip(unique.keys(), unique_vecs))
+        vecs = [vec_map[h] for h in order]
+        print(f"✅ Embedded {len(unique)} unique chunks")
+
         # Create and save vector store
-        db = FAISS.from_documents(docs, embeddings)
+        # One contiguous float32 buffer goes to FAISS in a single add() call
+        data = np.ascontiguousarray(vecs, dtype=np.float32)
+        if len(data) >= IVFPQ_MIN_VECTORS:
+            db = build_quantized_store(docs, data, embeddings)
+            print("✅ Built quantized IVF-PQ index")
+        else:
+            db = build_flat_store(docs, data, embeddings)
         db.save_local("core/rag_engine/vector_store")
         print("✅ Vector store created successfully at core/rag_engine/vector_store")
         
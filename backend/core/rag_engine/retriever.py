@@ -1,4 +1,8 @@
 import os
+import threading
+import time
+from functools import lru_cache
+from cachetools import LRUCache, TTLCache
 from dotenv import load_dotenv
 from langchain_community.vectorstores import FAISS
 from langchain_openai import AzureOpenAIEmbeddings
@@ -17,12 +21,33 @@ embeddings = AzureOpenAIEmbeddings(
     api_version=os.getenv("AZURE_OPENAI_API_VERSION")
 )
 
-# Load FAISS vector store
-try:
-    db = FAISS.load_local("core/rag_engine/vector_store", embeddings, allow_dangerous_deserialization=True)
-except Exception as e:
-    print(f"Warning: Could not load FAISS vector store: {e}")
-    db = None
+VECTOR_STORE_PATH = "core/rag_engine/vector_store"
+# Number of loaded vector stores kept in memory
+CACHED_VC_NUM = int(os.getenv("CACHED_VC_NUM", "4"))
+# Seconds to wait before trying to load a vector store again after a failure
+VECTOR_STORE_RETRY_SECONDS = float(os.getenv("VECTOR_STORE_RETRY_SECONDS", "300"))
+
+# Path -> monotonic time of the last failed load; lru_cache does not cache exceptions
+_load_failures = {}
+
+@lru_cache(maxsize=CACHED_VC_NUM)
+def load_vector_store(path: str):
+    """Load a FAISS vector store once per path and reuse it afterwards."""
+    return FAISS.load_local(path, embeddings, allow_dangerous_deserialization=True)
+
+def get_db(path: str = VECTOR_STORE_PATH):
+    """Get the cached FAISS vector store, or None if it can't be loaded."""
+    failed_at = _load_failures.get(path)
+    if failed_at is not None and time.monotonic() - failed_at < VECTOR_STORE_RETRY_SECONDS:
+        return None
+    try:
+        db = load_vector_store(path)
+    except Exception as e:
+        print(f"Warning: Could not load FAISS vector store: {e}")
+        _load_failures[path] = time.monotonic()
+        return None
+    _load_failures.pop(path, None)
+    return db
 
 # Setup LLM for answering questions
 try:
@@ -42,6 +67,7 @@ except Exception as e:
 
 def get_top_k_docs(query: str, k: int = 2):
     """Get top k documents from vector store."""
+    db = get_db()
     if not db:
         return []
     try:
@@ -50,28 +76,61 @@ def get_top_k_docs(query: str, k: int = 2):
         print(f"Error retrieving documents: {e}")
         return []
 
+def _normalize_query(query: str) -> str:
+    """Normalize a query for use as a cache key."""
+    return " ".join(query.split()).lower()
+
+# Generated answers, kept for at most an hour. The vector store is loaded once
+# per process, so knowledge base changes only take effect after a restart.
+_response_cache = TTLCache(maxsize=512, ttl=3600)
+_response_cache_lock = threading.Lock()
+
 def get_rag_response(query: str, k: int = 2) -> str:
     """Get a full GPT-generated answer based on top-k docs."""
-    if not db or not qa_chain:
+    if not get_db() or not qa_chain:
         return "I'm sorry, I couldn't find anything related to that. The knowledge base is currently unavailable."
     
+    key = (_normalize_query(query), k)
+    with _response_cache_lock:
+        cached = _response_cache.get(key)
+    if cached is not None:
+        return cached
+    
     try:
         docs = get_top_k_docs(query, k)
         if not docs:
             return "I'm sorry, I couldn't find anything related to that."
-        return qa_chain.run(input_documents=docs, question=query)
+        answer = qa_chain.run(input_documents=docs, question=query)
+        with _response_cache_lock:
+            _response_cache[key] = answer
+        return answer
     except Exception as e:
         print(f"Error in RAG response generation: {e}")
         return "I'm sorry, I encountered an error while processing your request. Please try again."
 
+# Retrieved context keyed by normalized query; the store is fixed for the process
+_context_cache = LRUCache(maxsize=1024)
+_context_cache_lock = threading.Lock()
+
 def get_relevant_context(query: str, top_k: int = 3) -> str:
     """Get relevant context for backward compatibility with existing code."""
+    db = get_db()
     if not db:
         return ""
     
+    key = (_normalize_query(query), top_k)
+    with _context_cache_lock:
+        cached = _context_cache.get(key)
+    if cached is not None:
+        return cached
+    
     try:
-        docs = get_top_k_docs(query, top_k)
-        return "\n\n".join([doc.page_content for doc in docs])
+        # Search with the query as given, like get_rag_response; failures are not cached
+        docs = db.similarity_search(query, k=top_k)
+        context = "\n\n".join([doc.page_content for doc in docs])
+        with _context_cache_lock:
+            _context_cache[key] = context
+        return context
     except Exception as e:
         print(f"Error getting relevant context: {e}")
         return ""
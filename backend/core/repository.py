@@ -3,9 +3,10 @@ Base repository implementation with common CRUD operations.
 This module provides concrete implementations of repository interfaces.
 """
 
-from typing import Generic, TypeVar, List, Optional, Any, Dict, Type
+import os
+from typing import Generic, TypeVar, Iterator, List, Optional, Any, Dict, Tuple, Type
 from sqlalchemy.orm import Session, Query
-from sqlalchemy import and_, or_
+from sqlalchemy import and_, func, literal, or_
 from pydantic import BaseModel
 from .interfaces import RepositoryInterface, SearchableRepositoryInterface
 
@@ -14,20 +15,73 @@ T = TypeVar('T')  # Model type
 CreateSchema = TypeVar('CreateSchema', bound=BaseModel)
 UpdateSchema = TypeVar('UpdateSchema', bound=BaseModel)
 
+# Set once the full-text indexes from scripts/migrate_fulltext_indexes.py exist;
+# only repositories that opt in with fulltext_search use it
+FULLTEXT_SEARCH_ENABLED = os.getenv("FULLTEXT_SEARCH_ENABLED", "false").lower() == "true"
+
+# Resolved model attributes keyed by (model, field name)
+_COL_CACHE: Dict[Tuple[type, str], Any] = {}
+
+def _in_filter(col, value):
+    return col.in_(value)
+
+def _range_filter(col, value):
+    # Handle range queries like {"min": 10, "max": 20}
+    if "min" in value and "max" in value:
+        return and_(col >= value["min"], col <= value["max"])
+    if "min" in value:
+        return col >= value["min"]
+    if "max" in value:
+        return col <= value["max"]
+    return None
+
+def _scalar_filter(col, value):
+    return col == value
+
+# Filter builders keyed by the type of the filter value; anything else is an equality match
+_FILTER_BUILDERS = {
+    list: _in_filter,
+    tuple: _in_filter,
+    dict: _range_filter,
+}
+
 class BaseRepository(RepositoryInterface[T], Generic[T, CreateSchema, UpdateSchema]):
     """
     Base repository implementation with common CRUD operations.
     Implements the Repository pattern for database operations.
     """
     
-    def __init__(self, model: Type[T]):
+    def __init__(self, model: Type[T], default_options: Optional[List[Any]] = None):
         """
         Initialize repository with the model class.
         
         Args:
             model: SQLAlchemy model class
+            default_options: Loader options (e.g. selectinload, load_only) applied to entity reads
         """
         self.model = model
+        self.default_options = list(default_options or [])
+        self._pk = self._get_primary_key_column()
+    
+    def _query(self, db: Session) -> Query:
+        """Start an entity query with the repository's default loader options."""
+        query = db.query(self.model)
+        if self.default_options:
+            query = query.options(*self.default_options)
+        return query
+    
+    def _base_query(self, db: Session, filters: Optional[Dict[str, Any]] = None, include_deleted: bool = False) -> Query:
+        """
+        Start a filtered entity query; the single hook for listing and counting.
+        
+        get_all, iter_all, get_all_with_total and count all build on it, so a
+        subclass that narrows the visible rows (see SoftDeleteRepository) only
+        overrides this method. include_deleted is ignored here.
+        """
+        query = self._query(db)
+        if filters:
+            query = self._apply_filters(query, filters)
+        return query
     
     def _get_primary_key_column(self):
         """Get the primary key column for the model."""
@@ -42,44 +96,91 @@ class BaseRepository(RepositoryInterface[T], Generic[T, CreateSchema, UpdateSche
     
     def get_by_id(self, db: Session, id: int) -> Optional[T]:
         """Get entity by primary key."""
-        return db.query(self.model).filter(self.model.LocationID == id).first()
+        # Served from the session's identity map when already loaded
+        return db.get(self.model, id, options=self.default_options or None)
     
     def get_all(
         self, 
         db: Session, 
         skip: int = 0, 
         limit: int = 100,
-        filters: Optional[Dict[str, Any]] = None
+        filters: Optional[Dict[str, Any]] = None,
+        include_deleted: bool = False
     ) -> List[T]:
         """Get all entities with optional filtering and pagination."""
-        query = db.query(self.model)
-        
-        if filters:
-            query = self._apply_filters(query, filters)
+        query = self._base_query(db, filters, include_deleted)
         
-        # Get primary key for ordering
-        pk_column = self._get_primary_key_column()
-        if pk_column is not None:
-            query = query.order_by(pk_column)
+        # Order by primary key
+        if self._pk is not None:
+            query = query.order_by(self._pk)
         
         return query.offset(skip).limit(limit).all()
     
+    def iter_all(
+        self, 
+        db: Session, 
+        filters: Optional[Dict[str, Any]] = None,
+        batch_size: int = 500
+    ) -> Iterator[T]:
+        """Stream all matching entities, fetching batch_size rows at a time."""
+        query = self._base_query(db, filters)
+        
+        if self._pk is not None:
+            query = query.order_by(self._pk)
+        
+        yield from query.yield_per(batch_size)
+    
+    def get_all_with_total(
+        self, 
+        db: Session, 
+        skip: int = 0, 
+        limit: int = 100,
+        filters: Optional[Dict[str, Any]] = None
+    ) -> Tuple[List[T], int]:
+        """Get a page of entities together with the total match count in one query."""
+        query = self._base_query(db, filters).add_columns(func.count().over().label('__total'))
+        
+        if self._pk is not None:
+            query = query.order_by(self._pk)
+        
+        rows = query.offset(skip).limit(limit).all()
+        if rows:
+            return [row[0] for row in rows], rows[0][1]
+        
+        # Past the last page there are no rows to carry the window total
+        return [], self.count(db, filters) if skip else 0
+    
     def create(self, db: Session, obj_in: CreateSchema) -> T:
         """Create a new entity."""
-        obj_data = obj_in.dict()
+        obj_data = obj_in.model_dump()
         db_obj = self.model(**obj_data)
         db.add(db_obj)
         db.commit()
         db.refresh(db_obj)
         return db_obj
     
+    def create_many(self, db: Session, objs_in: List[CreateSchema]) -> int:
+        """Insert many entities in one batch and one commit; returns the number inserted."""
+        payload = [obj_in.model_dump() for obj_in in objs_in]
+        if not payload:
+            return 0
+        
+        # Bulk insert skips the unit of work; inserted rows are not loaded back
+        db.bulk_insert_mappings(self.model, payload)
+        db.commit()
+        return len(payload)
+    
     def update(self, db: Session, id: int, obj_in: UpdateSchema) -> Optional[T]:
         """Update an existing entity."""
         db_obj = self.get_by_id(db, id)
         if not db_obj:
             return None
         
-        update_data = obj_in.dict(exclude_unset=True)
+        return self.update_instance(db, db_obj, obj_in)
+    
+    def update_instance(self, db: Session, db_obj: T, obj_in: UpdateSchema) -> T:
+        """Update an entity that has already been loaded."""
+        update_data = obj_in.model_dump(exclude_unset=True)
         for field, value in update_data.items():
             setattr(db_obj, field, value)
         
@@ -93,6 +194,10 @@ class BaseRepository(RepositoryInterface[T], Generic[T, CreateSchema, UpdateSche
         if not db_obj:
             return False
         
+        return self.delete_instance(db, db_obj)
+    
+    def delete_instance(self, db: Session, db_obj: T) -> bool:
+        """Delete an entity that has already been loaded (soft delete by default)."""
         # Soft delete - set IsActive to False if the field exists
         if hasattr(db_obj, 'IsActive'):
             db_obj.IsActive = False
@@ -106,46 +211,45 @@ class BaseRepository(RepositoryInterface[T], Generic[T, CreateSchema, UpdateSche
     
     def count(self, db: Session, filters: Optional[Dict[str, Any]] = None) -> int:
         """Count entities with optional filtering."""
-        query = db.query(self.model)
-        
-        if filters:
-            query = self._apply_filters(query, filters)
-        
-        return query.count()
+        return self._base_query(db, filters).count()
     
     def exists(self, db: Session, id: int) -> bool:
         """Check if entity exists."""
-        return db.query(self.model).filter(self.model.LocationID == id).first() is not None
+        return db.query(literal(1)).filter(self._pk == id).first() is not None
+    
+    def exists_by_field(self, db: Session, field: str, value: Any, exclude_id: Optional[Any] = None) -> bool:
+        """Check if any entity has the given field value, optionally ignoring one entity."""
+        query = db.query(literal(1)).filter(getattr(self.model, field) == value)
+        if exclude_id is not None:
+            query = query.filter(self._pk != exclude_id)
+        return query.first() is not None
     
     def get_by_field(self, db: Session, field: str, value: Any) -> Optional[T]:
         """Get entity by a specific field value."""
-        return db.query(self.model).filter(getattr(self.model, field) == value).first()
+        return self._query(db).filter(getattr(self.model, field) == value).first()
     
     def get_many_by_field(self, db: Session, field: str, value: Any) -> List[T]:
         """Get multiple entities by a specific field value."""
-        return db.query(self.model).filter(getattr(self.model, field) == value).all()
+        return self._query(db).filter(getattr(self.model, field) == value).all()
+    
+    def _col(self, name: str) -> Any:
+        """Resolve a model attribute by name, memoized per (model, name)."""
+        key = (self.model, name)
+        col = _COL_CACHE.get(key)
+        if col is None:
+            col = _COL_CACHE[key] = getattr(self.model, name)
+        return col
     
     def _apply_filters(self, query: Query, filters: Dict[str, Any]) -> Query:
         """Apply filters to the query."""
+        if not filters:
+            return query
+        
         for field, value in filters.items():
             if value is not None:
-                if isinstance(value, (list, tuple)):
-                    query = query.filter(getattr(self.model, field).in_(value))
-                elif isinstance(value, dict):
-                    # Handle range queries like {"min": 10, "max": 20}
-                    if "min" in value and "max" in value:
-                        query = query.filter(
-                            and_(
-                                getattr(self.model, field) >= value["min"],
-                                getattr(self.model, field) <= value["max"]
-                            )
-                        )
-                    elif "min" in value:
-                        query = query.filter(getattr(self.model, field) >= value["min"])
-                    elif "max" in value:
-                        query = query.filter(getattr(self.model, field) <= value["max"])
-                else:
-                    query = query.filter(getattr(self.model, field) == value)
+                criterion = _FILTER_BUILDERS.get(type(value), _scalar_filter)(self._col(field), value)
+                if criterion is not None:
+                    query = query.filter(criterion)
         
         return query
 
@@ -153,8 +257,16 @@ class SearchableRepository(BaseRepository[T, CreateSchema, UpdateSchema], Search
     """
     Searchable repository with text search capabilities.
     Extends BaseRepository with search functionality.
+    
+    Subclasses whose table and search fields are covered by a full-text index
+    (see scripts/migrate_fulltext_indexes.py) may set
+    ``fulltext_search = FULLTEXT_SEARCH_ENABLED`` to search with CONTAINS on
+    SQL Server (word-prefix matching served by the index) instead of a
+    LIKE '%q%' scan.
     """
     
+    fulltext_search = False
+    
     def search(
         self, 
         db: Session, 
@@ -164,24 +276,23 @@ class SearchableRepository(BaseRepository[T, CreateSchema, UpdateSchema], Search
         limit: int = 100
     ) -> List[T]:
         """Search entities by text query across specified fields."""
-        search_conditions = []
+        columns = [getattr(self.model, field) for field in fields if hasattr(self.model, field)]
         
-        for field in fields:
-            if hasattr(self.model, field):
-                search_conditions.append(
-                    getattr(self.model, field).ilike(f"%{query}%")
-                )
+        if self.fulltext_search and db.get_bind().dialect.name == "mssql":
+            # Quoted prefix term; embedded double quotes are escaped by doubling
+            term = '"' + query.replace('"', '""') + '*"'
+            search_conditions = [func.CONTAINS(column, term) for column in columns]
+        else:
+            search_conditions = [column.ilike(f"%{query}%") for column in columns]
         
         if not search_conditions:
             return []
         
-        # Get primary key for ordering
-        pk_column = self._get_primary_key_column()
-        
-        query = db.query(self.model).filter(or_(*search_conditions))
+        query = self._query(db).filter(or_(*search_conditions))
         
-        if pk_column is not None:
-            query = query.order_by(pk_column)
+        # Order by primary key
+        if self._pk is not None:
+            query = query.order_by(self._pk)
         
         return query.offset(skip).limit(limit).all()
     
@@ -201,30 +312,15 @@ class SoftDeleteRepository(BaseRepository[T, CreateSchema, UpdateSchema], Generi
     Extends BaseRepository with soft delete behavior.
     """
     
-    def get_all(
-        self, 
-        db: Session, 
-        skip: int = 0, 
-        limit: int = 100,
-        filters: Optional[Dict[str, Any]] = None,
-        include_deleted: bool = False
-    ) -> List[T]:
-        """Get all entities, optionally including deleted ones."""
-        query = db.query(self.model)
+    def _base_query(self, db: Session, filters: Optional[Dict[str, Any]] = None, include_deleted: bool = False) -> Query:
+        """Start a filtered entity query that skips soft-deleted rows unless include_deleted."""
+        query = super()._base_query(db, filters)
         
         # Only include active records unless explicitly requested
         if not include_deleted and hasattr(self.model, 'IsActive'):
             query = query.filter(self.model.IsActive == True)
         
-        if filters:
-            query = self._apply_filters(query, filters)
-        
-        # Get primary key for ordering
-        pk_column = self._get_primary_key_column()
-        if pk_column is not None:
-            query = query.order_by(pk_column)
-        
-        return query.offset(skip).limit(limit).all()
+        return query
     
     def hard_delete(self, db: Session, id: int) -> bool:
         """Hard delete an entity (permanently remove from database)."""
@@ -243,7 +339,7 @@ class SoftDeleteRepository(BaseRepository[T, CreateSchema, UpdateSchema], Generi
         
         db_obj = db.query(self.model).filter(
             and_(
-                self.model.LocationID == id,
+                self._pk == id,
                 self.model.IsActive == False
             )
         ).first()
@@ -4,11 +4,13 @@ This module provides concrete implementations of service interfaces.
 """
 
 from typing import Generic, TypeVar, List, Optional, Any, Dict, Type
-from sqlalchemy.orm import Session
-from pydantic import BaseModel
+from sqlalchemy import inspect as sa_inspect, literal
+from sqlalchemy.orm import Session, load_only
+from pydantic import BaseModel, TypeAdapter
 from fastapi import HTTPException
 from .interfaces import ServiceInterface, CRUDServiceInterface
 from .repository import BaseRepository
+from .queued_logging import get_queued_logger
 
 # Type variables
 T = TypeVar('T')  # Model type
@@ -16,6 +18,9 @@ CreateSchema = TypeVar('CreateSchema', bound=BaseModel)
 UpdateSchema = TypeVar('UpdateSchema', bound=BaseModel)
 ResponseSchema = TypeVar('ResponseSchema', bound=BaseModel)
 
+# Audit events are queued by the request thread and written by a background listener
+_audit_logger = get_queued_logger("audit", "AUDIT: %(message)s")
+
 class BaseService(ServiceInterface[T, CreateSchema, UpdateSchema, ResponseSchema], Generic[T, CreateSchema, UpdateSchema, ResponseSchema]):
     """
     Base service implementation with business logic abstraction.
@@ -32,6 +37,23 @@ class BaseService(ServiceInterface[T, CreateSchema, UpdateSchema, ResponseSchema
         """
         self.repository = repository
         self.response_model = response_model
+        # Validates whole lists of entities in one compiled validator call
+        self._list_adapter = TypeAdapter(List[response_model])
+    
+    def response_load_options(self) -> List[Any]:
+        """
+        Loader options that select only the columns the response model exposes.
+        
+        Pass the result as the repository's default_options to avoid reading
+        wide columns (large text blobs) that the response never returns.
+        """
+        mapper = sa_inspect(self.repository.model)
+        columns = [
+            getattr(self.repository.model, name)
+            for name in self.response_model.model_fields
+            if name in mapper.column_attrs
+        ]
+        return [load_only(*columns)] if columns else []
     
     def get_by_id(self, db: Session, id: int) -> Optional[ResponseSchema]:
         """Get entity by ID with business logic validation."""
@@ -39,7 +61,7 @@ class BaseService(ServiceInterface[T, CreateSchema, UpdateSchema, ResponseSchema
         if not entity:
             return None
         
-        return self.response_model.from_orm(entity)
+        return self.response_model.model_validate(entity, from_attributes=True)
     
     def get_all(
         self, 
@@ -50,7 +72,7 @@ class BaseService(ServiceInterface[T, CreateSchema, UpdateSchema, ResponseSchema
     ) -> List[ResponseSchema]:
         """Get all entities with business logic processing."""
         entities = self.repository.get_all(db, skip, limit, filters)
-        return [self.response_model.from_orm(entity) for entity in entities]
+        return self._list_adapter.validate_python(entities, from_attributes=True)
     
     def create(self, db: Session, obj_in: CreateSchema) -> ResponseSchema:
         """Create entity with business logic validation."""
@@ -59,35 +81,42 @@ class BaseService(ServiceInterface[T, CreateSchema, UpdateSchema, ResponseSchema
             raise HTTPException(status_code=400, detail="Business rule validation failed")
         
         entity = self.repository.create(db, obj_in)
-        return self.response_model.from_orm(entity)
+        return self.response_model.model_validate(entity, from_attributes=True)
+    
+    def create_many(self, db: Session, objs_in: List[CreateSchema]) -> int:
+        """Create entities in bulk with business logic validation; returns the number created."""
+        for obj_in in objs_in:
+            if not self.validate_business_rules(db, obj_in, "create"):
+                raise HTTPException(status_code=400, detail="Business rule validation failed")
+        
+        return self.repository.create_many(db, objs_in)
     
     def update(self, db: Session, id: int, obj_in: UpdateSchema) -> Optional[ResponseSchema]:
         """Update entity with business logic validation."""
-        # Check if entity exists
-        if not self.repository.exists(db, id):
+        # Load the entity once; it is updated in place below
+        db_obj = self.repository.get_by_id(db, id)
+        if not db_obj:
             raise HTTPException(status_code=404, detail="Entity not found")
         
         # Validate business rules
         if not self.validate_business_rules(db, obj_in, "update"):
             raise HTTPException(status_code=400, detail="Business rule validation failed")
         
-        entity = self.repository.update(db, id, obj_in)
-        if not entity:
-            return None
-        
-        return self.response_model.from_orm(entity)
+        entity = self.repository.update_instance(db, db_obj, obj_in)
+        return self.response_model.model_validate(entity, from_attributes=True)
     
     def delete(self, db: Session, id: int) -> bool:
         """Delete entity with business logic validation."""
-        # Check if entity exists
-        if not self.repository.exists(db, id):
+        # Load the entity once; it is deleted below
+        db_obj = self.repository.get_by_id(db, id)
+        if not db_obj:
             raise HTTPException(status_code=404, detail="Entity not found")
         
         # Validate business rules
         if not self.validate_business_rules(db, {"id": id}, "delete"):
             raise HTTPException(status_code=400, detail="Cannot delete entity due to business rules")
         
-        return self.repository.delete(db, id)
+        return self.repository.delete_instance(db, db_obj)
     
     def validate_business_rules(self, db: Session, obj_in: Any, operation: str) -> bool:
         """Validate business rules for the operation."""
@@ -115,12 +144,12 @@ class CRUDService(BaseService[T, CreateSchema, UpdateSchema, ResponseSchema], CR
         if not entity:
             return None
         
-        return self.response_model.from_orm(entity)
+        return self.response_model.model_validate(entity, from_attributes=True)
     
     def get_many_by_field(self, db: Session, field: str, value: Any) -> List[ResponseSchema]:
         """Get multiple entities by a specific field value."""
         entities = self.repository.get_many_by_field(db, field, value)
-        return [self.response_model.from_orm(entity) for entity in entities]
+        return self._list_adapter.validate_python(entities, from_attributes=True)
     
     def get_paginated(
         self, 
@@ -131,11 +160,10 @@ class CRUDService(BaseService[T, CreateSchema, UpdateSchema, ResponseSchema], CR
     ) -> Dict[str, Any]:
         """Get paginated results with metadata."""
         skip = (page - 1) * page_size
-        entities = self.repository.get_all(db, skip, page_size, filters)
-        total = self.repository.count(db, filters)
+        entities, total = self.repository.get_all_with_total(db, skip, page_size, filters)
         
         return {
-            "items": [self.response_model.from_orm(entity) for entity in entities],
+            "items": self._list_adapter.validate_python(entities, from_attributes=True),
             "total": total,
             "page": page,
             "page_size": page_size,
@@ -165,15 +193,12 @@ class BusinessRuleService(BaseService[T, CreateSchema, UpdateSchema, ResponseSch
     
     def validate_unique_constraint(self, db: Session, field: str, value: Any, exclude_id: Optional[int] = None) -> bool:
         """Validate unique constraint for a field."""
-        existing = self.repository.get_by_field(db, field, value)
-        if existing and (exclude_id is None or getattr(existing, 'LocationID') != exclude_id):
-            return False
-        return True
+        return not self.repository.exists_by_field(db, field, value, exclude_id)
     
     def validate_foreign_key_constraint(self, db: Session, foreign_key_field: str, foreign_key_value: Any, foreign_model: Type) -> bool:
         """Validate foreign key constraint."""
-        foreign_entity = db.query(foreign_model).filter(getattr(foreign_model, 'LocationID') == foreign_key_value).first()
-        return foreign_entity is not None
+        pk_column = sa_inspect(foreign_model).primary_key[0]
+        return db.query(literal(1)).filter(pk_column == foreign_key_value).first() is not None
     
     def validate_date_range(self, start_date: Any, end_date: Any) -> bool:
         """Validate date range (start_date <= end_date)."""
@@ -193,7 +218,7 @@ class AuditService(BaseService[T, CreateSchema, UpdateSchema, ResponseSchema]):
     def create(self, db: Session, obj_in: CreateSchema) -> ResponseSchema:
         """Create entity with audit trail."""
         # Log creation attempt
-        self._log_audit_event(db, "CREATE_ATTEMPT", obj_in.dict())
+        self._log_audit_event(db, "CREATE_ATTEMPT", obj_in.model_dump())
         
         result = super().create(db, obj_in)
         
@@ -205,7 +230,7 @@ class AuditService(BaseService[T, CreateSchema, UpdateSchema, ResponseSchema]):
     def update(self, db: Session, id: int, obj_in: UpdateSchema) -> Optional[ResponseSchema]:
         """Update entity with audit trail."""
         # Log update attempt
-        self._log_audit_event(db, "UPDATE_ATTEMPT", {"id": id, "data": obj_in.dict()})
+        self._log_audit_event(db, "UPDATE_ATTEMPT", {"id": id, "data": obj_in.model_dump()})
         
         result = super().update(db, id, obj_in)
         
@@ -238,7 +263,7 @@ class AuditService(BaseService[T, CreateSchema, UpdateSchema, ResponseSchema]):
         """Log audit event to database or external system."""
         # This is a placeholder for audit logging
         # In a real implementation, you would log to an audit table or external system
-        print(f"AUDIT: {event_type} - {data}")
+        _audit_logger.info("%s - %s", event_type, data)
 
 # Export commonly used service classes
 __all__ = [
@@ -3,11 +3,16 @@ Timesheet utility functions for week calculations and smart timesheet management
 """
 
 from datetime import date, timedelta
-from typing import Tuple, Optional
+from functools import lru_cache
+from typing import Dict, Iterator, List, Tuple, Optional
+from sqlalchemy import func, insert, literal, literal_column, select, update
 from sqlalchemy.orm import Session
+from fastapi import HTTPException
 from api.timesheet import models
 from api.leave import models as leave_models
 
+_SIX_DAYS = timedelta(days=6)
+
 
 def get_week_dates(work_date: date) -> Tuple[date, date]:
     """
@@ -19,13 +24,11 @@ def get_week_dates(work_date: date) -> Tuple[date, date]:
     Returns:
         Tuple of (week_start_date, week_end_date)
     """
-    # Find Monday of the week (weekday() returns 0=Monday, 6=Sunday)
-    days_since_monday = work_date.weekday()
-    week_start = work_date - timedelta(days=days_since_monday)
-    week_end = week_start + timedelta(days=6)  # Sunday
-    return week_start, week_end
+    week_start = get_week_start_date(work_date)
+    return week_start, week_start + _SIX_DAYS  # Sunday
 
 
+@lru_cache(maxsize=4096)
 def get_week_start_date(work_date: date) -> date:
     """
     Get the Monday date for the week containing the given date.
@@ -36,6 +39,7 @@ def get_week_start_date(work_date: date) -> date:
     Returns:
         Monday date of the week
     """
+    # Find Monday of the week (weekday() returns 0=Monday, 6=Sunday)
     days_since_monday = work_date.weekday()
     return work_date - timedelta(days=days_since_monday)
 
@@ -50,8 +54,7 @@ def is_valid_work_date(work_date: date) -> bool:
     Returns:
         True if it's a weekday (Monday-Friday) and not in the future, False otherwise
     """
-    from datetime import date as current_date
-    today = current_date.today()
+    today = date.today()
     
     # Check if it's a future date
     if work_date > today:
@@ -61,6 +64,57 @@ def is_valid_work_date(work_date: date) -> bool:
     return work_date.weekday() < 5  # Monday = 0, Friday = 4
 
 
+# Session.info key for the per-request (EmployeeID, WeekStartDate) timesheet cache
+_TIMESHEET_CACHE_KEY = "_timesheet_week_cache"
+
+# Leave states that block timesheet entry for the covered days
+BLOCKING_LEAVE_STATUSES = ("Submitted", "Manager-Approved", "HR-Approved")
+
+
+def _overlapping_leaves_query(db: Session, employee_id: int, start_date: date, end_date: date):
+    """
+    Query for an employee's blocking leave applications overlapping a date range.
+    
+    Shared by the conflict checks so the overlap predicate is built in one place;
+    SQLAlchemy's statement cache then reuses the compiled SQL across calls.
+    """
+    return db.query(leave_models.LeaveApplication).filter(
+        leave_models.LeaveApplication.EmployeeID == employee_id,
+        leave_models.LeaveApplication.StatusCode.in_(BLOCKING_LEAVE_STATUSES),
+        # Check for date overlap
+        leave_models.LeaveApplication.StartDate <= end_date,
+        leave_models.LeaveApplication.EndDate >= start_date
+    )
+
+
+def _conflict_details(db: Session, query, *parts) -> Optional[str]:
+    """
+    Format every row matched by a conflict query into one "; "-joined string.
+    
+    ``parts`` alternates string literals and columns, concatenated per row.
+    On SQL Server the database builds the message with STRING_AGG, so the
+    check costs a single round trip and no rows are transferred; other
+    dialects fetch the columns and join them in Python.
+    
+    Returns:
+        The joined details, or None if the query matches nothing
+    """
+    if db.get_bind().dialect.name == "mssql":
+        row_text = func.concat(*(literal(part) if isinstance(part, str) else part for part in parts))
+        return query.with_entities(func.string_agg(row_text, literal_column("'; '"))).scalar()
+    
+    columns = [part for part in parts if not isinstance(part, str)]
+    rows = query.with_entities(*columns).all()
+    if not rows:
+        return None
+    
+    details = []
+    for row in rows:
+        values = iter(row)
+        details.append("".join(part if isinstance(part, str) else str(next(values)) for part in parts))
+    return "; ".join(details)
+
+
 def check_leave_conflicts_for_timesheet_upload(
     db: Session, 
     employee_id: int, 
@@ -80,41 +134,94 @@ def check_leave_conflicts_for_timesheet_upload(
     Raises:
         HTTPException: If there are leave conflicts
     """
-    from fastapi import HTTPException
-    
     # Get the week dates for the work date
     week_start, week_end = get_week_dates(work_date)
     
     # Check for any leave applications that overlap with the timesheet week
     # and are in submitted or approved states
-    conflicting_leaves = db.query(leave_models.LeaveApplication).filter(
-        leave_models.LeaveApplication.EmployeeID == employee_id,
-        leave_models.LeaveApplication.StatusCode.in_([
-            "Submitted", 
-            "Manager-Approved", 
-            "HR-Approved"
-        ]),
-        # Check for date overlap
-        leave_models.LeaveApplication.StartDate <= week_end,
-        leave_models.LeaveApplication.EndDate >= week_start
-    ).all()
+    conflict_query = _overlapping_leaves_query(db, employee_id, week_start, week_end)
     
-    if conflicting_leaves:
-        leave_details = []
-        for leave in conflicting_leaves:
-            leave_details.append(
-                f"Leave {leave.LeaveApplicationID}: {leave.StartDate} to {leave.EndDate} "
-                f"(Status: {leave.StatusCode})"
-            )
-        
+    leave_details = _conflict_details(
+        db, conflict_query,
+        "Leave ", leave_models.LeaveApplication.LeaveApplicationID,
+        ": ", leave_models.LeaveApplication.StartDate,
+        " to ", leave_models.LeaveApplication.EndDate,
+        " (Status: ", leave_models.LeaveApplication.StatusCode, ")"
+    )
+    
+    if leave_details is not None:
         raise HTTPException(
             status_code=400,
-            detail=f"Cannot upload timesheet data. Employee has conflicting leave applications: {'; '.join(leave_details)}"
+            detail=f"Cannot upload timesheet data. Employee has conflicting leave applications: {leave_details}"
         )
     
     return False
 
 
+def check_leave_conflicts_for_timesheet_upload_bulk(
+    db: Session, 
+    employee_id: int, 
+    work_dates: List[date]
+) -> bool:
+    """
+    Check leave conflicts for many work dates with a single query.
+    
+    Equivalent to calling check_leave_conflicts_for_timesheet_upload for each
+    date in order, but fetches leaves for the whole upload range at once.
+    
+    Args:
+        db: Database session
+        employee_id: Employee ID
+        work_dates: Work dates being uploaded
+        
+    Returns:
+        False if there are no leave conflicts
+        
+    Raises:
+        HTTPException: If there are leave conflicts
+    """
+    if not work_dates:
+        return False
+    
+    week_starts = [get_week_start_date(d) for d in work_dates]
+    range_start = min(week_starts)
+    range_end = max(week_starts) + _SIX_DAYS
+    
+    # One query for every leave overlapping any week in the upload
+    leaves = _overlapping_leaves_query(db, employee_id, range_start, range_end).with_entities(
+        leave_models.LeaveApplication.LeaveApplicationID,
+        leave_models.LeaveApplication.StartDate,
+        leave_models.LeaveApplication.EndDate,
+        leave_models.LeaveApplication.StatusCode
+    ).all()
+    
+    if not leaves:
+        return False
+    
+    # Report the first week (in upload order) that overlaps a leave
+    for week_start in dict.fromkeys(week_starts):
+        week_end = week_start + _SIX_DAYS
+        conflicting_leaves = [
+            leave for leave in leaves
+            if leave.StartDate <= week_end and leave.EndDate >= week_start
+        ]
+        
+        if conflicting_leaves:
+            leave_details = []
+            for leave in conflicting_leaves:
+                leave_details.append(
+                    f"Leave {leave.LeaveApplicationID}: {leave.StartDate} to {leave.EndDate} "
+                    f"(Status: {leave.StatusCode})"
+                )
+            
+            raise HTTPException(
+                status_code=400,
+                detail=f"Cannot upload timesheet data. Employee has conflicting leave applications: {'; '.join(leave_details)}"
+            )
+    
+    return False
+
+
 def check_timesheet_conflicts_for_leave_application(
     db: Session, 
     employee_id: int, 
@@ -136,28 +243,26 @@ def check_timesheet_conflicts_for_leave_application(
     Raises:
         HTTPException: If there are timesheet conflicts
     """
-    from fastapi import HTTPException
-    
     # Check for timesheets in submitted or approved states that overlap with the leave period
-    conflicting_timesheets = db.query(models.Timesheet).filter(
+    conflict_query = db.query(models.Timesheet).filter(
         models.Timesheet.EmployeeID == employee_id,
         models.Timesheet.StatusCode.in_(["Submitted", "Approved"]),
         # Check for date overlap
         models.Timesheet.WeekStartDate <= end_date,
         models.Timesheet.WeekEndDate >= start_date
-    ).all()
+    )
     
-    if conflicting_timesheets:
-        timesheet_details = []
-        for timesheet in conflicting_timesheets:
-            timesheet_details.append(
-                f"Timesheet {timesheet.TimesheetID}: Week of {timesheet.WeekStartDate} "
-                f"(Status: {timesheet.StatusCode})"
-            )
-        
+    timesheet_details = _conflict_details(
+        db, conflict_query,
+        "Timesheet ", models.Timesheet.TimesheetID,
+        ": Week of ", models.Timesheet.WeekStartDate,
+        " (Status: ", models.Timesheet.StatusCode, ")"
+    )
+    
+    if timesheet_details is not None:
         raise HTTPException(
             status_code=400,
-            detail=f"Cannot apply for leave. Employee has conflicting timesheets in submitted/approved state: {'; '.join(timesheet_details)}"
+            detail=f"Cannot apply for leave. Employee has conflicting timesheets in submitted/approved state: {timesheet_details}"
         )
     
     return False
@@ -181,10 +286,12 @@ def check_leave_conflicts_for_timesheet_submission(
     Raises:
         HTTPException: If there are leave conflicts
     """
-    from fastapi import HTTPException
-    
-    # Get the timesheet with details
-    timesheet = db.query(models.Timesheet).filter(
+    # Get the timesheet week (only the columns the checks read)
+    timesheet = db.query(
+        models.Timesheet.EmployeeID,
+        models.Timesheet.WeekStartDate,
+        models.Timesheet.WeekEndDate
+    ).filter(
         models.Timesheet.TimesheetID == timesheet_id
     ).first()
     
@@ -192,7 +299,10 @@ def check_leave_conflicts_for_timesheet_submission(
         raise HTTPException(status_code=404, detail="Timesheet not found")
     
     # Get timesheet details to check for days with hours worked
-    timesheet_details = db.query(models.TimesheetDetail).filter(
+    timesheet_details = db.query(
+        models.TimesheetDetail.WorkDate,
+        models.TimesheetDetail.HoursWorked
+    ).filter(
         models.TimesheetDetail.TimesheetID == timesheet_id,
         models.TimesheetDetail.HoursWorked > 0
     ).all()
@@ -208,17 +318,14 @@ def check_leave_conflicts_for_timesheet_submission(
     
     # Check for any leave applications that overlap with the timesheet week
     # and are in submitted or approved states
-    conflicting_leaves = db.query(leave_models.LeaveApplication).filter(
-        leave_models.LeaveApplication.EmployeeID == timesheet.EmployeeID,
-        leave_models.LeaveApplication.StatusCode.in_([
-            "Submitted", 
-            "Manager-Approved", 
-            "HR-Approved"
-        ]),
-        # Check for date overlap
-        leave_models.LeaveApplication.StartDate <= timesheet.WeekEndDate,
-        leave_models.LeaveApplication.EndDate >= timesheet.WeekStartDate
-    ).all()
+    conflict_query = _overlapping_leaves_query(
+        db, timesheet.EmployeeID, timesheet.WeekStartDate, timesheet.WeekEndDate
+    )
+    
+    # Cheap TOP 1 probe first; leaves are only loaded when one overlaps the week
+    if conflict_query.with_entities(literal(1)).first() is None:
+        return False
+    conflicting_leaves = conflict_query.all()
     
     # Check for specific conflicts where leave dates overlap with work dates
     conflicting_dates = []
@@ -293,55 +400,39 @@ def get_or_create_timesheet_for_date(
     """
     week_start, week_end = get_week_dates(work_date)
     
-    # Use a retry mechanism to handle race conditions
-    max_retries = 3
-    for attempt in range(max_retries):
-        try:
-            # Check if timesheet exists for this week
-            timesheet = db.query(models.Timesheet).filter(
-                models.Timesheet.EmployeeID == employee_id,
-                models.Timesheet.WeekStartDate == week_start
-            ).first()
-            
-            if not timesheet:
-                # Create new draft timesheet
-                timesheet = models.Timesheet(
-                    EmployeeID=employee_id,
-                    WeekStartDate=week_start,
-                    WeekEndDate=week_end,
-                    StatusCode="Draft",
-                    TotalHours=0.0
-                )
-                db.add(timesheet)
-                db.commit()
-                db.refresh(timesheet)
-            
-            return timesheet
-            
-        except Exception as e:
-            # If it's a unique constraint violation, try to get the existing timesheet
-            if "UNIQUE KEY constraint" in str(e) or "duplicate key" in str(e).lower():
-                db.rollback()
-                # Try to get the existing timesheet that was created by another request
-                timesheet = db.query(models.Timesheet).filter(
-                    models.Timesheet.EmployeeID == employee_id,
-                    models.Timesheet.WeekStartDate == week_start
-                ).first()
-                
-                if timesheet:
-                    return timesheet
-                else:
-                    # If we still can't find it, retry
-                    if attempt < max_retries - 1:
-                        continue
-                    else:
-                        raise e
-            else:
-                # For other errors, don't retry
-                raise e
-     
-    # This should never be reached, but just in case
-    raise Exception("Failed to get or create timesheet after multiple attempts")
+    timesheet = get_timesheet_for_employee_week(db, employee_id, week_start)
+    if timesheet:
+        return timesheet
+    
+    # Insert the draft only if the week is still missing. UPDLOCK + HOLDLOCK make
+    # the NOT EXISTS probe hold a key-range lock, so concurrent requests can't
+    # both insert; the loser simply inserts nothing.
+    timesheets = models.Timesheet.__table__
+    week_exists = select(literal(1)).select_from(timesheets).with_hint(
+        timesheets, "WITH (UPDLOCK, HOLDLOCK)", "mssql"
+    ).where(
+        timesheets.c.EmployeeID == employee_id,
+        timesheets.c.WeekStartDate == week_start
+    ).exists()
+    
+    db.execute(
+        insert(timesheets).from_select(
+            ["EmployeeID", "WeekStartDate", "WeekEndDate", "StatusCode", "TotalHours"],
+            select(
+                literal(employee_id),
+                literal(week_start),
+                literal(week_end),
+                literal("Draft"),
+                literal(0)
+            ).where(~week_exists)
+        )
+    )
+    db.commit()
+    
+    timesheet = get_timesheet_for_employee_week(db, employee_id, week_start)
+    if not timesheet:
+        raise Exception("Failed to get or create timesheet")
+    return timesheet
 
 
 def calculate_weekly_total_hours(db: Session, timesheet_id: int) -> float:
@@ -355,30 +446,45 @@ def calculate_weekly_total_hours(db: Session, timesheet_id: int) -> float:
     Returns:
         Total hours as float
     """
-    details = db.query(models.TimesheetDetail).filter(
+    # SUM runs in the database; only the scalar total comes back
+    total_hours = db.query(
+        func.coalesce(func.sum(models.TimesheetDetail.HoursWorked), 0)
+    ).filter(
         models.TimesheetDetail.TimesheetID == timesheet_id
-    ).all()
-    
-    total_hours = sum(detail.HoursWorked for detail in details)
-    return round(total_hours, 2)
+    ).scalar()
+    return round(float(total_hours), 2)
 
 
-def update_timesheet_total_hours(db: Session, timesheet_id: int) -> None:
+def update_timesheet_total_hours(db: Session, timesheet_id: int) -> Optional[float]:
     """
     Update the total hours for a timesheet based on its details.
     
     Args:
         db: Database session
         timesheet_id: Timesheet ID
+        
+    Returns:
+        The new total hours, or None if the timesheet does not exist
     """
-    timesheet = db.query(models.Timesheet).filter(
-        models.Timesheet.TimesheetID == timesheet_id
-    ).first()
-    
-    if timesheet:
-        total_hours = calculate_weekly_total_hours(db, timesheet_id)
-        timesheet.TotalHours = total_hours
-        db.commit()
+    # Single UPDATE with a correlated SUM; no timesheet or detail rows are loaded.
+    # RETURNING (OUTPUT inserted.TotalHours on SQL Server) hands back the new
+    # total so callers don't need a refresh to read it.
+    total_hours = db.query(
+        func.coalesce(func.sum(models.TimesheetDetail.HoursWorked), 0)
+    ).filter(
+        models.TimesheetDetail.TimesheetID == timesheet_id
+    ).scalar_subquery()
+    
+    new_total = db.execute(
+        update(models.Timesheet)
+        .where(models.Timesheet.TimesheetID == timesheet_id)
+        .values(TotalHours=total_hours)
+        .returning(models.Timesheet.TotalHours)
+        .execution_options(synchronize_session=False)
+    ).scalar()
+    db.commit()
+    
+    return float(new_total) if new_total is not None else None
 
 
 def get_timesheet_for_employee_week(
@@ -397,10 +503,22 @@ def get_timesheet_for_employee_week(
     Returns:
         Timesheet object if found, None otherwise
     """
-    return db.query(models.Timesheet).filter(
+    # Memoized on the session, which lives for one request. Only hits are
+    # cached, so a week created later in the request is still found; an entry
+    # whose object has been deleted or detached is ignored.
+    cache = db.info.setdefault(_TIMESHEET_CACHE_KEY, {})
+    key = (employee_id, week_start_date)
+    timesheet = cache.get(key)
+    if timesheet is not None and timesheet in db:
+        return timesheet
+    
+    timesheet = db.query(models.Timesheet).filter(
         models.Timesheet.EmployeeID == employee_id,
         models.Timesheet.WeekStartDate == week_start_date
     ).first()
+    if timesheet is not None:
+        cache[key] = timesheet
+    return timesheet
 
 
 def get_timesheet_details_for_date(
@@ -419,18 +537,37 @@ def get_timesheet_details_for_date(
     Returns:
         TimesheetDetail object if found, None otherwise
     """
-    week_start, _ = get_week_dates(work_date)
+    return get_timesheet_details_for_dates(db, employee_id, [work_date]).get(work_date)
+
+
+def get_timesheet_details_for_dates(
+    db: Session, 
+    employee_id: int, 
+    work_dates: List[date]
+) -> Dict[date, models.TimesheetDetail]:
+    """
+    Get timesheet details for an employee on several dates with one query.
     
-    # Get timesheet for this week
-    timesheet = get_timesheet_for_employee_week(db, employee_id, week_start)
-    if not timesheet:
-        return None
+    Args:
+        db: Database session
+        employee_id: Employee ID
+        work_dates: Work dates to look up
+        
+    Returns:
+        Dict of WorkDate to TimesheetDetail; dates without a detail are absent
+    """
+    if not work_dates:
+        return {}
     
-    # Get detail for this specific date
-    return db.query(models.TimesheetDetail).filter(
-        models.TimesheetDetail.TimesheetID == timesheet.TimesheetID,
-        models.TimesheetDetail.WorkDate == work_date
-    ).first()
+    details = db.query(models.TimesheetDetail).join(
+        models.Timesheet,
+        models.Timesheet.TimesheetID == models.TimesheetDetail.TimesheetID
+    ).filter(
+        models.Timesheet.EmployeeID == employee_id,
+        models.TimesheetDetail.WorkDate.in_(set(work_dates))
+    ).all()
+    
+    return {detail.WorkDate: detail for detail in details}
 
 
 def validate_timesheet_submission(db: Session, timesheet_id: int) -> bool:
@@ -444,30 +581,42 @@ def validate_timesheet_submission(db: Session, timesheet_id: int) -> bool:
     Returns:
         True if timesheet can be submitted, False otherwise
     """
-    timesheet = db.query(models.Timesheet).filter(
+    timesheet = db.query(
+        models.Timesheet.WeekStartDate,
+        models.Timesheet.WeekEndDate
+    ).filter(
         models.Timesheet.TimesheetID == timesheet_id
     ).first()
     
     if not timesheet:
         return False
     
-    # Get all weekdays in the timesheet period
-    weekdays = []
-    current_date = timesheet.WeekStartDate
-    while current_date <= timesheet.WeekEndDate:
-        if is_valid_work_date(current_date):
-            weekdays.append(current_date)
-        current_date += timedelta(days=1)
-    
-    # Get existing details
-    details = db.query(models.TimesheetDetail).filter(
-        models.TimesheetDetail.TimesheetID == timesheet_id
-    ).all()
-    
-    detail_dates = {detail.WorkDate for detail in details}
+    # Weekdays in the timesheet period up to today (same rule as is_valid_work_date)
+    today = date.today()
+    period_days = (timesheet.WeekEndDate - timesheet.WeekStartDate).days + 1
+    expected = {
+        day for day in (timesheet.WeekStartDate + timedelta(days=i) for i in range(period_days))
+        if day.weekday() < 5 and day <= today
+    }
+    
+    # Get existing detail dates
+    detail_dates = {
+        work_date for (work_date,) in db.query(models.TimesheetDetail.WorkDate).filter(
+            models.TimesheetDetail.TimesheetID == timesheet_id
+        )
+    }
     
     # Check if all weekdays have details
-    return all(weekday in detail_dates for weekday in weekdays)
+    return expected <= detail_dates
+
+
+def _employee_timesheets_for_period_stmt(employee_id: int, start_date: date, end_date: date):
+    """Build the SELECT for an employee's timesheets within a date range."""
+    return select(models.Timesheet).where(
+        models.Timesheet.EmployeeID == employee_id,
+        models.Timesheet.WeekStartDate >= start_date,
+        models.Timesheet.WeekEndDate <= end_date
+    ).order_by(models.Timesheet.WeekStartDate)
 
 
 def get_employee_timesheets_for_period(
@@ -488,8 +637,32 @@ def get_employee_timesheets_for_period(
     Returns:
         List of timesheet objects
     """
-    return db.query(models.Timesheet).filter(
-        models.Timesheet.EmployeeID == employee_id,
-        models.Timesheet.WeekStartDate >= start_date,
-        models.Timesheet.WeekEndDate <= end_date
-    ).order_by(models.Timesheet.WeekStartDate).all() 
\ No newline at end of file
+    return list(db.scalars(_employee_timesheets_for_period_stmt(employee_id, start_date, end_date)))
+
+
+def iter_employee_timesheets_for_period(
+    db: Session, 
+    employee_id: int, 
+    start_date: date, 
+    end_date: date,
+    batch_size: int = 200
+) -> Iterator[models.Timesheet]:
+    """
+    Stream an employee's timesheets within a date range.
+    
+    Rows are fetched in batches of ``batch_size`` so long periods do not
+    hold every timesheet in memory. Consume the iterator before the session
+    is closed or committed.
+    
+    Args:
+        db: Database session
+        employee_id: Employee ID
+        start_date: Start date of period
+        end_date: End date of period
+        batch_size: Number of rows fetched per round trip
+        
+    Yields:
+        Timesheet objects ordered by week start date
+    """
+    stmt = _employee_timesheets_for_period_stmt(employee_id, start_date, end_date)
+    yield from db.scalars(stmt.execution_options(yield_per=batch_size))
@@ -14,95 +14,118 @@ def fix_hr_roles():
     
     try:
         # Import after setting up path
-        from core.database import get_db
+        from sqlalchemy import and_, or_
+        from core.auth import get_role_id
+        from core.database import get_db_session
         from api.auth.models import Role, EmployeeRole
         from api.employee.models import Employee
+        from api.team.models import Team
+        from api.department.models import Department
         
-        db = next(get_db())
-        
-        # Check if HR role exists
-        hr_role = db.query(Role).filter(Role.RoleName == "HR").first()
-        if not hr_role:
-            print("❌ HR role not found in database")
-            print("Creating HR role...")
-            hr_role = Role(RoleName="HR", Description="HR staff, access to employee records")
-            db.add(hr_role)
-            db.commit()
-            db.refresh(hr_role)
-            print("✅ HR role created")
-        else:
-            print(f"✅ HR role found: {hr_role.RoleName} (ID: {hr_role.RoleID})")
-        
-        # Find employees who should have HR role (you can customize this logic)
-        # For now, let's assign HR role to employees in HR department or with HR in their name
-        potential_hr_employees = db.query(Employee).filter(
-            Employee.IsActive == True,
-            Employee.FirstName.like('%HR%') | 
-            Employee.LastName.like('%HR%') |
-            Employee.EmployeeCode.like('%HR%')
-        ).all()
-        
-        if not potential_hr_employees:
-            print("No potential HR employees found by name/ID pattern")
-            print("Assigning HR role to first few active employees for testing...")
-            potential_hr_employees = db.query(Employee).filter(
-                Employee.IsActive == True
-            ).limit(3).all()
-        
-        print(f"Found {len(potential_hr_employees)} potential HR employees:")
-        
-        for employee in potential_hr_employees:
-            print(f"  - {employee.FirstName} {employee.LastName} ({employee.EmployeeCode})")
+        with get_db_session() as db:
+            # Check if HR role exists (only its id is needed)
+            hr_role_id = get_role_id(db, "HR")
+            if hr_role_id is None:
+                print("❌ HR role not found in database")
+                print("Creating HR role...")
+                hr_role = Role(RoleName="HR", Description="HR staff, access to employee records")
+                db.add(hr_role)
+                db.commit()
+                hr_role_id = hr_role.RoleID
+                print("✅ HR role created")
+            else:
+                print(f"✅ HR role found: HR (ID: {hr_role_id})")
             
-            # Check if they already have HR role
-            existing_hr_role = db.query(EmployeeRole).filter(
-                EmployeeRole.EmployeeID == employee.EmployeeID,
-                EmployeeRole.RoleID == hr_role.RoleID,
-                EmployeeRole.IsActive == True
-            ).first()
+            # Find employees who should have HR role (you can customize this logic)
+            # For now, employees whose team belongs to the HR department or whose code
+            # starts with "HR". Equality on DepartmentCode and a prefix LIKE can both
+            # use indexes, unlike leading-wildcard matches on names; only the columns
+            # printed and assigned below are loaded.
+            # The outer join to an active HR assignment brings back EmployeeRoleID,
+            # NULL for candidates that still need the role, so no per-candidate
+            # membership query is needed.
+            candidate_query = db.query(
+                Employee.EmployeeID,
+                Employee.FirstName,
+                Employee.LastName,
+                Employee.EmployeeCode,
+                EmployeeRole.EmployeeRoleID
+            ).outerjoin(
+                EmployeeRole, and_(
+                    EmployeeRole.EmployeeID == Employee.EmployeeID,
+                    EmployeeRole.RoleID == hr_role_id,
+                    EmployeeRole.IsActive == True
+                )
+            ).filter(
+                Employee.IsActive == True
+            )
             
-            if existing_hr_role:
-                print(f"    ✅ Already has HR role")
-            else:
-                print(f"    ➕ Assigning HR role...")
-                # Create HR role assignment
-                hr_assignment = EmployeeRole(
-                    EmployeeID=employee.EmployeeID,
-                    RoleID=hr_role.RoleID,
-                    AssignedByID=employee.EmployeeID,  # Self-assigned for now
-                    IsActive=True
+            potential_hr_employees = candidate_query.join(
+                Team, Team.TeamID == Employee.TeamID
+            ).join(
+                Department, Department.DepartmentID == Team.DepartmentID
+            ).filter(
+                or_(
+                    Department.DepartmentCode == "HR",
+                    Employee.EmployeeCode.like("HR%")
                 )
-                db.add(hr_assignment)
-        
-        db.commit()
-        print("✅ HR role assignments completed")
-        
-        # Verify the assignments
-        print("\n🔍 Verifying HR role assignments:")
-        hr_assignments = db.query(EmployeeRole, Employee, Role).join(
-            Employee, EmployeeRole.EmployeeID == Employee.EmployeeID
-        ).join(
-            Role, EmployeeRole.RoleID == Role.RoleID
-        ).filter(
-            Role.RoleName == "HR",
-            EmployeeRole.IsActive == True,
-            Employee.IsActive == True
-        ).all()
-        
-        if hr_assignments:
-            print(f"✅ Found {len(hr_assignments)} HR users:")
-            for assignment, employee, role in hr_assignments:
+            ).all()
+            
+            if not potential_hr_employees:
+                print("No potential HR employees found by department/code")
+                print("Assigning HR role to first few active employees for testing...")
+                potential_hr_employees = candidate_query.limit(3).all()
+            
+            print(f"Found {len(potential_hr_employees)} potential HR employees:")
+            
+            to_insert = []
+            for employee in potential_hr_employees:
                 print(f"  - {employee.FirstName} {employee.LastName} ({employee.EmployeeCode})")
-        else:
-            print("❌ No HR users found")
-        
+                
+                if employee.EmployeeRoleID is not None:
+                    print(f"    ✅ Already has HR role")
+                else:
+                    print(f"    ➕ Assigning HR role...")
+                    to_insert.append({
+                        "EmployeeID": employee.EmployeeID,
+                        "RoleID": hr_role_id,
+                        "AssignedByID": employee.EmployeeID,  # Self-assigned for now
+                        "IsActive": True
+                    })
+            
+            # Single executemany for all new assignments
+            if to_insert:
+                db.bulk_insert_mappings(EmployeeRole, to_insert)
+            
+            db.commit()
+            print("✅ HR role assignments completed")
+            
+            # Verify the assignments
+            print("\n🔍 Verifying HR role assignments:")
+            hr_assignments = db.query(
+                Employee.FirstName,
+                Employee.LastName,
+                Employee.EmployeeCode
+            ).select_from(EmployeeRole).join(
+                Employee, EmployeeRole.EmployeeID == Employee.EmployeeID
+            ).join(
+                Role, EmployeeRole.RoleID == Role.RoleID
+            ).filter(
+                Role.RoleName == "HR",
+                EmployeeRole.IsActive == True,
+                Employee.IsActive == True
+            ).all()
+            
+            if hr_assignments:
+                print(f"✅ Found {len(hr_assignments)} HR users:")
+                print("\n".join(f"  - {employee.FirstName} {employee.LastName} ({employee.EmployeeCode})" for employee in hr_assignments))
+            else:
+                print("❌ No HR users found")
+            
     except Exception as e:
         print(f"❌ Error: {e}")
         import traceback
         traceback.print_exc()
-    finally:
-        if 'db' in locals():
-            db.close()
 
 if __name__ == "__main__":
     fix_hr_roles() 
\ No newline at end of file
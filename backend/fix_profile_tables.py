@@ -14,8 +14,8 @@ load_dotenv()
 # Add the backend directory to the Python path
 sys.path.append(os.path.dirname(os.path.abspath(__file__)))
 
-from sqlalchemy import text
-from core.database import engine, Base, get_db_session
+from sqlalchemy import inspect, literal
+from core.database import engine, get_db_session
 from api.profile.models import ProfilePicture
 from api.employee.models import Employee
 
@@ -24,20 +24,19 @@ def create_profile_tables():
     try:
         print("Creating ProfilePictures table...")
         
-        # Import all models to ensure they are registered
-        import api.employee.models
-        import api.profile.models
-        
-        # Create all tables
-        Base.metadata.create_all(bind=engine)
-        print("✅ ProfilePictures table created successfully")
+        # One reflection probe for this table instead of create_all walking
+        # every table in the metadata
+        if inspect(engine).has_table(ProfilePicture.__tablename__):
+            print("✅ ProfilePictures table already exists")
+        else:
+            ProfilePicture.__table__.create(bind=engine)
+            print("✅ ProfilePictures table created successfully")
         
         # Test the table
         with get_db_session() as db:
-            # Check if table exists
-            result = db.execute(text("SELECT COUNT(*) FROM ProfilePictures"))
-            count = result.scalar()
-            print(f"✅ ProfilePictures table verified - {count} records found")
+            # TOP 1 probe; verifies the table is queryable without counting every row
+            has_records = db.query(literal(1)).select_from(ProfilePicture).first() is not None
+            print(f"✅ ProfilePictures table verified - {'has records' if has_records else 'no records yet'}")
             
     except Exception as e:
         print(f"❌ Error creating ProfilePictures table: {e}")
@@ -7,12 +7,14 @@ import sys
 import os
 sys.path.append(os.path.dirname(os.path.abspath(__file__)))
 
-from sqlalchemy import create_engine
+from sqlalchemy import create_engine, func, select, update
 from sqlalchemy.orm import sessionmaker
 from core.database import get_database_url
-from core.timesheet_utils import update_timesheet_total_hours
 from api.timesheet import models
 
+# Rows written per UPDATE batch / commit
+BATCH_SIZE = 1000
+
 def fix_timesheet_totals():
     """Fix total hours for all timesheets by recalculating from details."""
     engine = create_engine(get_database_url())
@@ -20,22 +22,41 @@ def fix_timesheet_totals():
     db = SessionLocal()
     
     try:
-        # Get all timesheets
-        timesheets = db.query(models.Timesheet).all()
-        print(f"Found {len(timesheets)} timesheets to update")
+        # Recomputed total per timesheet, correlated so it runs as one set-based scan
+        detail_total = select(
+            func.coalesce(func.sum(models.TimesheetDetail.HoursWorked), 0)
+        ).where(
+            models.TimesheetDetail.TimesheetID == models.Timesheet.TimesheetID
+        ).scalar_subquery()
+        
+        # Only timesheets whose stored total is stale, with old and new values for the report
+        stale = db.query(
+            models.Timesheet.TimesheetID,
+            models.Timesheet.TotalHours,
+            detail_total.label("NewTotal")
+        ).filter(models.Timesheet.TotalHours != detail_total).all()
+        print(f"Found {len(stale)} timesheets to update")
+        
+        # Recompute in the UPDATE itself so detail edits made since the SELECT
+        # are not overwritten. Committing per batch of the stale ids keeps each
+        # transaction (and its log) small.
+        stale_ids = [timesheet_id for timesheet_id, _, _ in stale]
+        for start in range(0, len(stale_ids), BATCH_SIZE):
+            db.execute(
+                update(models.Timesheet)
+                .where(
+                    models.Timesheet.TimesheetID.in_(stale_ids[start:start + BATCH_SIZE]),
+                    models.Timesheet.TotalHours != detail_total
+                )
+                .values(TotalHours=detail_total)
+                .execution_options(synchronize_session=False)
+            )
+            db.commit()
         
-        updated_count = 0
-        for timesheet in timesheets:
-            old_total = timesheet.TotalHours
-            update_timesheet_total_hours(db, timesheet.TimesheetID)
-            db.refresh(timesheet)
-            new_total = timesheet.TotalHours
-            
-            if old_total != new_total:
-                print(f"Updated timesheet {timesheet.TimesheetID}: {old_total} -> {new_total} hours")
-                updated_count += 1
+        for timesheet_id, old_total, new_total in stale:
+            print(f"Updated timesheet {timesheet_id}: {old_total} -> {new_total} hours")
         
-        print(f"Updated {updated_count} timesheets")
+        print(f"Updated {len(stale)} timesheets")
         
     except Exception as e:
         print(f"Error: {e}")
@@ -6,11 +6,12 @@ from fastapi import FastAPI, Request, HTTPException, status
 from fastapi.middleware.cors import CORSMiddleware
 from fastapi.middleware.trustedhost import TrustedHostMiddleware
 from fastapi.middleware.gzip import GZipMiddleware
-from fastapi.responses import JSONResponse
+from fastapi.responses import JSONResponse, ORJSONResponse
 from fastapi.exceptions import RequestValidationError
 from starlette.exceptions import HTTPException as StarletteHTTPException
 from sqlalchemy.exc import SQLAlchemyError
 import time
+import anyio
 
 # Load environment variables from .env file
 load_dotenv()
@@ -34,6 +35,9 @@ from api.notifications.routes import router as notifications_router
 
 # Import database utilities
 from core.database import init_database, get_database_health, test_database_connection, get_connection_stats, reset_connection_pool
+from core.notification_worker import start_delivery_batcher, stop_delivery_batcher, start_expiry_purger, stop_expiry_purger
+from core.container import register_services
+from core.queued_logging import get_queued_logger, start_queued_logging, stop_queued_logging
 
 # Configure logging
 logging.basicConfig(
@@ -42,6 +46,9 @@ logging.basicConfig(
 )
 logger = logging.getLogger(__name__)
 
+# Access log records are queued by the request path and written by a background listener
+_access_logger = get_queued_logger("access", "%(asctime)s - %(name)s - %(levelname)s - %(message)s")
+
 # Environment configuration
 ENVIRONMENT = os.getenv("ENVIRONMENT", "development")
 DEBUG = os.getenv("DEBUG", "false").lower() == "true"
@@ -65,6 +72,7 @@ async def lifespan(app: FastAPI):
     """
     # Startup
     logger.info("Starting EchoByte HR Management API...")
+    start_queued_logging()
     
     try:
         # Initialize database
@@ -77,7 +85,17 @@ async def lifespan(app: FastAPI):
         else:
             logger.error("Database connection failed")
             raise Exception("Database connection failed")
+        
+        # Register services in dependency injection container
+        register_services()
+        logger.info("Services registered in dependency injection container")
             
+        # Start the batched notification delivery worker
+        await start_delivery_batcher()
+        
+        # Periodically delete notifications past their ExpiresAt
+        await start_expiry_purger()
+        
         logger.info("EchoByte HR Management API started successfully")
         
     except Exception as e:
@@ -88,6 +106,9 @@ async def lifespan(app: FastAPI):
     
     # Shutdown
     logger.info("Shutting down EchoByte HR Management API...")
+    await stop_expiry_purger()
+    await stop_delivery_batcher()
+    stop_queued_logging()
 
 # Initialize FastAPI application
 app = FastAPI(
@@ -121,6 +142,7 @@ app = FastAPI(
     redoc_url="/redoc" if DEBUG else None,
     openapi_url="/openapi.json" if DEBUG else None,
     lifespan=lifespan,
+    default_response_class=ORJSONResponse,
     debug=DEBUG
 )
 
@@ -152,8 +174,9 @@ app.add_middleware(
     max_age=86400,  # 24 hours
 )
 
-# GZip Middleware (Compression)
-app.add_middleware(GZipMiddleware, minimum_size=1000)
+# GZip Middleware (Compression) - level 1 trades a little ratio for much cheaper
+# per-response compression; small payloads such as /health skip it entirely
+app.add_middleware(GZipMiddleware, minimum_size=1500, compresslevel=1)
 
 # Request Logging Middleware
 @app.middleware("http")
@@ -161,22 +184,31 @@ async def log_requests(request: Request, call_next):
     """
     Middleware to log all incoming requests and their processing time.
     """
-    start_time = time.time()
+    start_time = time.perf_counter()
     
-    # Log request
-    logger.info(f"Request: {request.method} {request.url.path}")
+    if _access_logger.isEnabledFor(logging.DEBUG):
+        _access_logger.debug("Request: %s %s", request.method, request.url.path)
     
     # Process request
     response = await call_next(request)
     
     # Calculate processing time
-    process_time = time.time() - start_time
+    process_time = time.perf_counter() - start_time
     
-    # Log response
-    logger.info(f"Response: {response.status_code} - {process_time:.4f}s")
+    # One structured record per request
+    _access_logger.info(
+        "%s %s %s %.4fs",
+        request.method, request.url.path, response.status_code, process_time,
+        extra={
+            "method": request.method,
+            "path": request.url.path,
+            "status": response.status_code,
+            "dur_ms": round(process_time * 1000, 2),
+        },
+    )
     
     # Add processing time to response headers
-    response.headers["X-Process-Time"] = str(process_time)
+    response.headers["X-Process-Time"] = f"{process_time:.4f}"
     
     return response
 
@@ -396,6 +428,10 @@ async def root():
         "database_health": "/health/database"
     }
 
+async def _database_health() -> dict:
+    """Run the (TTL-cached) database health probe off the event loop."""
+    return await anyio.to_thread.run_sync(get_database_health)
+
 @app.get("/health", tags=["Health"])
 async def health_check():
     """
@@ -413,7 +449,7 @@ async def database_health_check():
     """
     Database health check endpoint.
     """
-    return get_database_health()
+    return await _database_health()
 
 @app.get("/health/connections", tags=["Health"])
 async def connection_pool_monitor():
@@ -423,7 +459,7 @@ async def connection_pool_monitor():
     """
     return {
         "connection_stats": get_connection_stats(),
-        "database_health": get_database_health(),
+        "database_health": await _database_health(),
         "timestamp": time.time()
     }
 
@@ -495,7 +531,7 @@ async def full_health_check():
     
     # Check database health
     try:
-        db_health = get_database_health()
+        db_health = await _database_health()
         health_status["components"]["database"] = db_health["status"]
         if db_health["status"] != "healthy":
             health_status["status"] = "degraded"
@@ -536,27 +572,6 @@ async def api_info():
         }
     }
 
-# Startup event (alternative to lifespan for compatibility)
-@app.on_event("startup")
-async def startup_event():
-    """
-    Application startup event handler.
-    """
-    logger.info("Application startup event triggered")
-    
-    # Register services in dependency injection container
-    from core.container import register_services
-    register_services()
-    logger.info("Services registered in dependency injection container")
-
-# Shutdown event (alternative to lifespan for compatibility)
-@app.on_event("shutdown")
-async def shutdown_event():
-    """
-    Application shutdown event handler.
-    """
-    logger.info("Application shutdown event triggered")
-
 if __name__ == "__main__":
     import uvicorn
     
@@ -8,6 +8,7 @@ import os
 sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 
 from dotenv import load_dotenv
+from sqlalchemy import insert
 from sqlalchemy.orm import Session
 from passlib.context import CryptContext
 from core.database import SessionLocal
@@ -19,43 +20,67 @@ load_dotenv()
 # Password hashing
 pwd_context = CryptContext(schemes=["bcrypt"], deprecated="auto")
 
-def create_test_user():
-    """Create a test user for authentication testing"""
+# Users seeded for authentication testing
+TEST_USERS = [
+    {
+        "UserID": "admin",
+        "Username": "admin",
+        "Email": "admin@echobyte.com",
+        "Password": "admin123",
+        "IsActive": True,
+    },
+]
+
+def create_seed_users(users):
+    """Insert the given users in one executemany, skipping usernames that already exist"""
     db = SessionLocal()
     
     try:
-        # Check if test user already exists
-        existing_user = db.query(User).filter(User.Username == "admin").first()
-        
-        if existing_user:
-            print("Test user 'admin' already exists!")
-            return
+        # One lookup for every username instead of a query per user
+        usernames = [user["Username"] for user in users]
+        existing = {
+            username for (username,) in
+            db.query(User.Username).filter(User.Username.in_(usernames)).all()
+        }
         
-        # Create test user
-        hashed_password = pwd_context.hash("admin123")
+        for username in usernames:
+            if username in existing:
+                print(f"Test user '{username}' already exists!")
         
-        test_user = User(
-            Username="admin",
-            Email="admin@echobyte.com",
-            Password=hashed_password,
-            IsActive=True
-        )
+        # Hash up front so the insert is a single round trip with one commit
+        rows = [
+            {**user, "Password": pwd_context.hash(user["Password"])}
+            for user in users
+            if user["Username"] not in existing
+        ]
+        if not rows:
+            return 0
         
-        db.add(test_user)
+        # ORM-enabled insert so rows are keyed by attribute (Password -> HashedPassword)
+        db.execute(insert(User), rows)
         db.commit()
-        db.refresh(test_user)
         
-        print("✅ Test user created successfully!")
-        print(f"Username: admin")
-        print(f"Password: admin123")
-        print(f"Email: admin@echobyte.com")
-        print(f"UserID: {test_user.UserID}")
+        for user in users:
+            if user["Username"] in existing:
+                continue
+            print("✅ Test user created successfully!")
+            print(f"Username: {user['Username']}")
+            print(f"Password: {user['Password']}")
+            print(f"Email: {user['Email']}")
+            print(f"UserID: {user['UserID']}")
+        
+        return len(rows)
         
     except Exception as e:
-        print(f"❌ Error creating test user: {e}")
+        print(f"❌ Error creating test users: {e}")
         db.rollback()
+        return 0
     finally:
         db.close()
 
+def create_test_user():
+    """Create a test user for authentication testing"""
+    create_seed_users(TEST_USERS)
+
 if __name__ == "__main__":
     create_test_user() 
\ No newline at end of file
@@ -0,0 +1,72 @@
+"""
+Database migration script for full-text search
+Creates the full-text catalog and the full-text indexes used by SearchableRepository
+"""
+
+import logging
+from sqlalchemy import text
+from core.database import engine
+
+logger = logging.getLogger(__name__)
+
+CATALOG_NAME = "EchoByteFullTextCatalog"
+
+# Table -> columns searched through SearchableRepository.search. A repository
+# may only opt in with fulltext_search once its table and fields are listed here.
+FULLTEXT_INDEXES = {
+    "Locations": ["LocationName", "City", "Country"],
+}
+
+
+def migrate_fulltext_indexes():
+    """Create the full-text catalog and indexes if they don't exist yet"""
+    
+    try:
+        # Full-text DDL cannot run inside a user transaction
+        with engine.connect().execution_options(isolation_level="AUTOCOMMIT") as connection:
+            installed = connection.execute(text(
+                "SELECT FULLTEXTSERVICEPROPERTY('IsFullTextInstalled')"
+            )).scalar()
+            if not installed:
+                logger.error("Full-text search is not installed on this SQL Server instance")
+                return False
+            
+            logger.info(f"Creating full-text catalog {CATALOG_NAME}...")
+            connection.execute(text(f"""
+                IF NOT EXISTS (SELECT * FROM sys.fulltext_catalogs WHERE name = '{CATALOG_NAME}')
+                CREATE FULLTEXT CATALOG {CATALOG_NAME}
+            """))
+            
+            for table, columns in FULLTEXT_INDEXES.items():
+                exists = connection.execute(text(
+                    "SELECT 1 FROM sys.fulltext_indexes WHERE object_id = OBJECT_ID(:table)"
+                ), {"table": f"dbo.{table}"}).first()
+                if exists:
+                    logger.info(f"Full-text index on {table} already exists")
+                    continue
+                
+                # KEY INDEX needs the name of the table's primary key index
+                key_index = connection.execute(text("""
+                    SELECT name FROM sys.indexes
+                    WHERE object_id = OBJECT_ID(:table) AND is_primary_key = 1
+                """), {"table": f"dbo.{table}"}).scalar()
+                
+                connection.execute(text(f"""
+                    CREATE FULLTEXT INDEX ON dbo.{table} ({", ".join(columns)})
+                    KEY INDEX {key_index}
+                    ON {CATALOG_NAME}
+                    WITH CHANGE_TRACKING AUTO
+                """))
+                logger.info(f"Created full-text index on {table} ({', '.join(columns)})")
+        
+        logger.info("Full-text migration completed; set FULLTEXT_SEARCH_ENABLED=true to use it")
+        return True
+        
+    except Exception as e:
+        logger.error(f"Full-text migration failed: {e}")
+        return False
+
+
+if __name__ == "__main__":
+    logging.basicConfig(level=logging.INFO)
+    migrate_fulltext_indexes()
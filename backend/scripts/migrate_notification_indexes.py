@@ -0,0 +1,56 @@
+"""
+Database migration script for notification indexes
+Replaces IX_Notifications_UserRead with the filtered unread index on existing databases
+"""
+
+import logging
+from sqlalchemy import text
+from core.database import engine
+
+logger = logging.getLogger(__name__)
+
+OLD_INDEX_NAME = "IX_Notifications_UserRead"
+NEW_INDEX_NAME = "IX_Notifications_Unread_Filtered"
+
+
+def _index_exists(connection, name):
+    return connection.execute(text("""
+        SELECT 1 FROM sys.indexes
+        WHERE object_id = OBJECT_ID('dbo.Notifications') AND name = :name
+    """), {"name": name}).first() is not None
+
+
+def migrate_notification_indexes():
+    """Create the filtered unread index and drop the index it replaces"""
+
+    try:
+        with engine.begin() as connection:
+            if _index_exists(connection, NEW_INDEX_NAME):
+                logger.info(f"{NEW_INDEX_NAME} already exists")
+            else:
+                # Id is the clustered key and is carried by the index without INCLUDE
+                connection.execute(text(f"""
+                    CREATE INDEX {NEW_INDEX_NAME}
+                        ON dbo.Notifications (UserID, CreatedAt)
+                        INCLUDE (Type, Title)
+                        WHERE IsRead = 0
+                """))
+                logger.info(f"Created {NEW_INDEX_NAME}")
+
+            if _index_exists(connection, OLD_INDEX_NAME):
+                connection.execute(text(f"DROP INDEX {OLD_INDEX_NAME} ON dbo.Notifications"))
+                logger.info(f"Dropped {OLD_INDEX_NAME}")
+            else:
+                logger.info(f"{OLD_INDEX_NAME} already dropped")
+
+        logger.info("Notification index migration completed successfully")
+        return True
+
+    except Exception as e:
+        logger.error(f"Notification index migration failed: {e}")
+        return False
+
+
+if __name__ == "__main__":
+    logging.basicConfig(level=logging.INFO)
+    migrate_notification_indexes()
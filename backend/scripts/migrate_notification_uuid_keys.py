@@ -0,0 +1,210 @@
+"""
+Database migration script for notification UUID keys
+Converts the NVARCHAR(36) notification Id / NotificationID columns to UNIQUEIDENTIFIER
+"""
+
+import logging
+from sqlalchemy import text
+from core.database import engine
+
+logger = logging.getLogger(__name__)
+
+# Table -> UUID key columns stored as NVARCHAR(36) by the original notification DDL
+UUID_KEY_COLUMNS = {
+    "Notifications": ["Id"],
+    "NotificationDeliveries": ["Id", "NotificationID"],
+    "LeaveNotifications": ["Id", "NotificationID"],
+    "TimesheetNotifications": ["Id", "NotificationID"],
+    "AssetNotifications": ["Id", "NotificationID"],
+    "TicketNotifications": ["Id", "NotificationID"],
+    "LearningNotifications": ["Id", "NotificationID"],
+}
+
+
+def _quoted(names):
+    return ", ".join(f"[{name}]" for name in names)
+
+
+def _column_type(connection, table, column):
+    return connection.execute(text("""
+        SELECT DATA_TYPE FROM INFORMATION_SCHEMA.COLUMNS
+        WHERE TABLE_SCHEMA = 'dbo' AND TABLE_NAME = :table AND COLUMN_NAME = :column
+    """), {"table": table, "column": column}).scalar()
+
+
+def _foreign_keys(connection, tables):
+    """Foreign keys that reference any of the tables being converted"""
+    rows = connection.execute(text(f"""
+        SELECT fk.object_id, fk.name, OBJECT_NAME(fk.parent_object_id) AS parent_table,
+               OBJECT_NAME(fk.referenced_object_id) AS referenced_table,
+               fk.delete_referential_action_desc, fk.update_referential_action_desc
+        FROM sys.foreign_keys fk
+        WHERE fk.referenced_object_id IN ({", ".join(f"OBJECT_ID('dbo.{t}')" for t in tables)})
+    """)).all()
+
+    foreign_keys = []
+    for fk_id, name, parent_table, referenced_table, on_delete, on_update in rows:
+        columns = connection.execute(text("""
+            SELECT pc.name, rc.name
+            FROM sys.foreign_key_columns fkc
+            JOIN sys.columns pc ON pc.object_id = fkc.parent_object_id AND pc.column_id = fkc.parent_column_id
+            JOIN sys.columns rc ON rc.object_id = fkc.referenced_object_id AND rc.column_id = fkc.referenced_column_id
+            WHERE fkc.constraint_object_id = :fk_id
+            ORDER BY fkc.constraint_column_id
+        """), {"fk_id": fk_id}).all()
+        foreign_keys.append({
+            "name": name,
+            "table": parent_table,
+            "columns": [parent for parent, _ in columns],
+            "referenced_table": referenced_table,
+            "referenced_columns": [referenced for _, referenced in columns],
+            "on_delete": on_delete.replace("_", " "),
+            "on_update": on_update.replace("_", " "),
+        })
+    return foreign_keys
+
+
+def _primary_key(connection, table):
+    row = connection.execute(text("""
+        SELECT kc.name, i.type_desc, i.index_id
+        FROM sys.key_constraints kc
+        JOIN sys.indexes i ON i.object_id = kc.parent_object_id AND i.index_id = kc.unique_index_id
+        WHERE kc.parent_object_id = OBJECT_ID(:table) AND kc.type = 'PK'
+    """), {"table": f"dbo.{table}"}).first()
+    if row is None:
+        return None
+    name, type_desc, index_id = row
+    columns = connection.execute(text("""
+        SELECT c.name FROM sys.index_columns ic
+        JOIN sys.columns c ON c.object_id = ic.object_id AND c.column_id = ic.column_id
+        WHERE ic.object_id = OBJECT_ID(:table) AND ic.index_id = :index_id
+        ORDER BY ic.key_ordinal
+    """), {"table": f"dbo.{table}", "index_id": index_id}).scalars().all()
+    return {"name": name, "type": type_desc, "columns": columns}
+
+
+def _dependent_indexes(connection, table, key_columns):
+    """Non-key indexes whose key or INCLUDE list uses one of the columns being converted"""
+    rows = connection.execute(text(f"""
+        SELECT i.index_id, i.name, i.is_unique, i.type_desc, i.filter_definition
+        FROM sys.indexes i
+        WHERE i.object_id = OBJECT_ID(:table)
+          AND i.is_primary_key = 0 AND i.type > 0
+          AND EXISTS (
+              SELECT 1 FROM sys.index_columns ic
+              JOIN sys.columns c ON c.object_id = ic.object_id AND c.column_id = ic.column_id
+              WHERE ic.object_id = i.object_id AND ic.index_id = i.index_id
+                AND c.name IN ({", ".join(f"'{column}'" for column in key_columns)})
+          )
+    """), {"table": f"dbo.{table}"}).all()
+
+    indexes = []
+    for index_id, name, is_unique, type_desc, filter_definition in rows:
+        columns = connection.execute(text("""
+            SELECT c.name, ic.is_descending_key, ic.is_included_column
+            FROM sys.index_columns ic
+            JOIN sys.columns c ON c.object_id = ic.object_id AND c.column_id = ic.column_id
+            WHERE ic.object_id = OBJECT_ID(:table) AND ic.index_id = :index_id
+            ORDER BY ic.is_included_column, ic.key_ordinal, ic.index_column_id
+        """), {"table": f"dbo.{table}", "index_id": index_id}).all()
+        indexes.append({
+            "name": name,
+            "table": table,
+            "unique": bool(is_unique),
+            "type": type_desc,
+            "keys": [f"[{column}] {'DESC' if descending else 'ASC'}" for column, descending, included in columns if not included],
+            "include": [column for column, _, included in columns if included],
+            "filter": filter_definition,
+        })
+    return indexes
+
+
+def _create_index_sql(index):
+    sql = (
+        f"CREATE {'UNIQUE ' if index['unique'] else ''}{index['type']} INDEX [{index['name']}] "
+        f"ON dbo.[{index['table']}] ({', '.join(index['keys'])})"
+    )
+    if index["include"]:
+        sql += f" INCLUDE ({_quoted(index['include'])})"
+    if index["filter"]:
+        sql += f" WHERE {index['filter']}"
+    return sql
+
+
+def migrate_notification_uuid_keys():
+    """Convert notification UUID keys to UNIQUEIDENTIFIER, rebuilding the keys and indexes that use them"""
+
+    try:
+        # SQL Server DDL is transactional, so a failure leaves the schema untouched
+        with engine.begin() as connection:
+            tables = {
+                table: [
+                    column for column in columns
+                    if _column_type(connection, table, column) in ("nvarchar", "varchar")
+                ]
+                for table, columns in UUID_KEY_COLUMNS.items()
+            }
+            tables = {table: columns for table, columns in tables.items() if columns}
+            if not tables:
+                logger.info("Notification keys are already UNIQUEIDENTIFIER; nothing to migrate")
+                return True
+
+            for table, columns in tables.items():
+                for column in columns:
+                    invalid = connection.execute(text(
+                        f"SELECT COUNT(*) FROM dbo.[{table}] "
+                        f"WHERE [{column}] IS NOT NULL AND TRY_CONVERT(UNIQUEIDENTIFIER, [{column}]) IS NULL"
+                    )).scalar()
+                    if invalid:
+                        logger.error(f"{table}.{column} has {invalid} values that are not UUIDs; aborting")
+                        return False
+
+            foreign_keys = _foreign_keys(connection, tables)
+            primary_keys = {table: _primary_key(connection, table) for table in tables}
+            indexes = [
+                index
+                for table, columns in tables.items()
+                for index in _dependent_indexes(connection, table, columns)
+            ]
+
+            logger.info(f"Dropping {len(foreign_keys)} foreign keys, {len(indexes)} indexes and {len(tables)} primary keys...")
+            for fk in foreign_keys:
+                connection.execute(text(f"ALTER TABLE dbo.[{fk['table']}] DROP CONSTRAINT [{fk['name']}]"))
+            for index in indexes:
+                connection.execute(text(f"DROP INDEX [{index['name']}] ON dbo.[{index['table']}]"))
+            for table, pk in primary_keys.items():
+                if pk is not None:
+                    connection.execute(text(f"ALTER TABLE dbo.[{table}] DROP CONSTRAINT [{pk['name']}]"))
+
+            for table, columns in tables.items():
+                for column in columns:
+                    connection.execute(text(f"ALTER TABLE dbo.[{table}] ALTER COLUMN [{column}] UNIQUEIDENTIFIER NOT NULL"))
+                logger.info(f"Converted {table} ({', '.join(columns)})")
+
+            for table, pk in primary_keys.items():
+                if pk is not None:
+                    connection.execute(text(
+                        f"ALTER TABLE dbo.[{table}] ADD CONSTRAINT [{pk['name']}] "
+                        f"PRIMARY KEY {pk['type']} ({_quoted(pk['columns'])})"
+                    ))
+            for index in indexes:
+                connection.execute(text(_create_index_sql(index)))
+            for fk in foreign_keys:
+                connection.execute(text(
+                    f"ALTER TABLE dbo.[{fk['table']}] ADD CONSTRAINT [{fk['name']}] "
+                    f"FOREIGN KEY ({_quoted(fk['columns'])}) "
+                    f"REFERENCES dbo.[{fk['referenced_table']}] ({_quoted(fk['referenced_columns'])}) "
+                    f"ON DELETE {fk['on_delete']} ON UPDATE {fk['on_update']}"
+                ))
+
+        logger.info("Notification UUID key migration completed successfully")
+        return True
+
+    except Exception as e:
+        logger.error(f"Notification UUID key migration failed: {e}")
+        return False
+
+
+if __name__ == "__main__":
+    logging.basicConfig(level=logging.INFO)
+    migrate_notification_uuid_keys()
@@ -250,9 +250,9 @@ class TestLocationService:
         for key, value in sample_location_data.items():
             setattr(mock_location, key, value)
         
-        with patch.object(location_service.repository, 'exists', return_value=True), \
+        with patch.object(location_service.repository, 'get_by_id', return_value=mock_location), \
              patch.object(location_service.repository, 'validate_location_name_unique', return_value=True), \
-             patch.object(location_service.repository, 'update', return_value=mock_location):
+             patch.object(location_service.repository, 'update_instance', return_value=mock_location):
             # Act
             result = location_service.update_location(mock_db, 1, sample_location_update)
             
@@ -263,7 +263,7 @@ class TestLocationService:
     def test_update_location_not_found(self, mock_db, location_service, sample_location_update):
         """Test location update when location doesn't exist."""
         # Arrange
-        with patch.object(location_service.repository, 'exists', return_value=False):
+        with patch.object(location_service.repository, 'get_by_id', return_value=None):
             # Act & Assert
             with pytest.raises(HTTPException) as exc_info:
                 location_service.update_location(mock_db, 999, sample_location_update)
@@ -274,8 +274,8 @@ class TestLocationService:
     def test_delete_location_success(self, mock_db, location_service):
         """Test successful location deletion through service."""
         # Arrange
-        with patch.object(location_service.repository, 'exists', return_value=True), \
-             patch.object(location_service.repository, 'delete', return_value=True):
+        with patch.object(location_service.repository, 'get_by_id', return_value=Mock()), \
+             patch.object(location_service.repository, 'delete_instance', return_value=True):
             # Act
             result = location_service.delete_location(mock_db, 1)
             
@@ -285,7 +285,7 @@ class TestLocationService:
     def test_delete_location_not_found(self, mock_db, location_service):
         """Test location deletion when location doesn't exist."""
         # Arrange
-        with patch.object(location_service.repository, 'exists', return_value=False):
+        with patch.object(location_service.repository, 'get_by_id', return_value=None):
             # Act & Assert
             with pytest.raises(HTTPException) as exc_info:
                 location_service.delete_location(mock_db, 999)
@@ -0,0 +1,113 @@
+"""
+Tests for the employee locking decorator.
+"""
+
+import asyncio
+import threading
+import pytest
+from unittest.mock import Mock, patch
+from sqlalchemy.orm import Session
+from fastapi import HTTPException
+
+from core.locking import EmployeeLockManager, LockingError, LockTimeoutError, with_employee_lock
+
+
+class LockedService:
+    """Minimal service with one sync and one async decorated method."""
+    
+    def __init__(self):
+        self.calls = []
+    
+    @with_employee_lock()
+    def delete_pictures(self, db: Session, employee_id: int, locked_employee=None):
+        self.calls.append(("sync", employee_id, locked_employee))
+        return {"deleted": employee_id}
+    
+    @with_employee_lock()
+    async def update_pictures(self, db: Session, employee_id: int, locked_employee=None):
+        self.calls.append(("async", employee_id, locked_employee))
+        return {"updated": employee_id}
+
+
+class TestWithEmployeeLock:
+    """Test cases for with_employee_lock."""
+    
+    @pytest.fixture
+    def mock_db(self):
+        """Create a mock database session."""
+        return Mock(spec=Session)
+    
+    @pytest.fixture
+    def employee(self):
+        """A locked employee record."""
+        employee = Mock()
+        employee.EmployeeID = 7
+        return employee
+    
+    def test_sync_method_runs_its_body(self, mock_db, employee):
+        """A decorated sync method is called directly and returns its result."""
+        service = LockedService()
+        with patch.object(EmployeeLockManager, "lock_employee_with_retry", return_value=employee) as lock:
+            result = service.delete_pictures(mock_db, 7)
+        
+        assert result == {"deleted": 7}
+        assert service.calls == [("sync", 7, employee)]
+        lock.assert_called_once_with(mock_db, 7, 3, 1.0, 30)
+    
+    def test_async_method_is_awaited(self, mock_db, employee):
+        """A decorated coroutine method stays awaitable and runs its body."""
+        service = LockedService()
+        with patch.object(EmployeeLockManager, "lock_employee_with_retry_async", return_value=employee) as lock:
+            result = asyncio.run(service.update_pictures(mock_db, 7))
+        
+        assert result == {"updated": 7}
+        assert service.calls == [("async", 7, employee)]
+        lock.assert_called_once()
+    
+    def test_sync_method_missing_employee(self, mock_db):
+        """A missing employee is reported as 404 without running the body."""
+        service = LockedService()
+        with patch.object(EmployeeLockManager, "lock_employee_with_retry", return_value=None):
+            with pytest.raises(HTTPException) as exc_info:
+                service.delete_pictures(mock_db, 7)
+        
+        assert exc_info.value.status_code == 404
+        assert service.calls == []
+    
+    def test_sync_method_lock_conflict(self, mock_db):
+        """A failed lock is reported as 409 without running the body."""
+        service = LockedService()
+        with patch.object(EmployeeLockManager, "lock_employee_with_retry", side_effect=LockingError("busy")):
+            with pytest.raises(HTTPException) as exc_info:
+                service.delete_pictures(mock_db, 7)
+        
+        assert exc_info.value.status_code == 409
+        assert service.calls == []
+
+
+class TestLockEmployeeWithRetryAsync:
+    """Test cases for EmployeeLockManager.lock_employee_with_retry_async."""
+    
+    def test_lock_runs_off_the_event_loop_and_retries_once(self):
+        """The blocking lock query runs in a worker thread and a timeout is retried."""
+        employee = Mock()
+        threads = []
+        
+        def lock(db, employee_id, timeout_seconds):
+            threads.append(threading.get_ident())
+            if len(threads) == 1:
+                raise LockTimeoutError("timed out")
+            return employee
+        
+        async def run():
+            with patch.object(EmployeeLockManager, "lock_employee_for_update", side_effect=lock):
+                result = await EmployeeLockManager.lock_employee_with_retry_async(
+                    Mock(spec=Session), 7, retry_delay_seconds=0.01
+                )
+            return result, threading.get_ident()
+        
+        result, loop_thread = asyncio.run(run())
+        
+        assert result is employee
+        assert len(threads) == 2
+        assert loop_thread not in threads
@@ -740,6 +740,13 @@ VALUES
 -- CREATE INDEX IX_Departments_ParentID  ON dbo.Departments(ParentDepartmentID);
 -- GO
 
+/* Leave/timesheet conflict checks (employee + date overlap) */
+CREATE INDEX IX_LeaveApplications_EmployeeStatusDates
+    ON dbo.LeaveApplications(EmployeeID, StatusCode, StartDate, EndDate);
+CREATE INDEX IX_Timesheets_EmployeeOverlap
+    ON dbo.Timesheets(EmployeeID, WeekEndDate, WeekStartDate);
+GO
+
 
 /* ============================================================
    12.  IT Asset Management